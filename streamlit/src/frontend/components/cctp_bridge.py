@@ -39,6 +39,8 @@ POLYGON_TX_EXPLORER_TEMPLATE = "https://amoy.polygonscan.com/tx/{tx_hash}"
 DEFAULT_MIN_FINALITY = 0
 # Reserve this many base units so Circle can charge a minimal cross-chain fee.
 DEFAULT_MAX_FEE_BUFFER = 1
+# Receipt polling cadence; web3 defaults to 0.1 s, faster than Arc seals miniblocks.
+RECEIPT_POLL_LATENCY = 0.2
 
 LOGGER_NAME = "arc.cctp_bridge"
 logger = logging.getLogger(LOGGER_NAME)
@@ -497,7 +499,7 @@ def transfer_arc_usdc(
     try:
         _log("Waiting for transfer confirmation…")
         receipt = w3.eth.wait_for_transaction_receipt(
-            tx_hash, timeout=confirmation_timeout
+            tx_hash, timeout=confirmation_timeout, poll_latency=RECEIPT_POLL_LATENCY
         )
     except Exception as exc:
         raise BridgeError(f"ARC transfer not confirmed: {exc}") from exc
@@ -580,7 +582,7 @@ def _auto_mint_on_polygon(
     log(f"Polygon receiveMessage broadcast: {tx_hash.hex()}. Waiting for confirmation…")
     try:
         receipt = w3.eth.wait_for_transaction_receipt(
-            tx_hash, timeout=confirmation_timeout
+            tx_hash, timeout=confirmation_timeout, poll_latency=RECEIPT_POLL_LATENCY
         )
     except Exception as exc:
         raise BridgeError(f"Polygon receiveMessage not confirmed: {exc}") from exc
@@ -753,7 +755,7 @@ def initiate_arc_to_polygon_bridge(
     try:
         _log("Waiting for prepare transaction confirmation…")
         prepare_receipt = w3.eth.wait_for_transaction_receipt(
-            prepare_hash, timeout=attestation_timeout
+            prepare_hash, timeout=attestation_timeout, poll_latency=RECEIPT_POLL_LATENCY
         )
     except Exception as exc:
         raise BridgeError(f"Bridge preparation not confirmed: {exc}") from exc
@@ -809,7 +811,7 @@ def initiate_arc_to_polygon_bridge(
         try:
             _log("Waiting for approval confirmation…")
             approve_receipt = w3.eth.wait_for_transaction_receipt(
-                approve_hash, timeout=attestation_timeout
+                approve_hash, timeout=attestation_timeout, poll_latency=RECEIPT_POLL_LATENCY
             )
         except Exception as exc:
             raise BridgeError(f"USDC approval not confirmed: {exc}") from exc
@@ -872,7 +874,7 @@ def initiate_arc_to_polygon_bridge(
     try:
         _log("Waiting for depositForBurn confirmation…")
         burn_receipt = w3.eth.wait_for_transaction_receipt(
-            burn_hash, timeout=attestation_timeout
+            burn_hash, timeout=attestation_timeout, poll_latency=RECEIPT_POLL_LATENCY
         )
     except Exception as exc:
         raise BridgeError(f"depositForBurn transaction not confirmed: {exc}") from exc
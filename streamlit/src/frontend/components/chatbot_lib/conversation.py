@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable, Dict, Iterable, Optional
 
 import streamlit as st
 
+from ..mcp_lib.constants import POOL_TOOL_ROLES, SBT_TOOL_ROLES
 from ..toolkit import render_tool_message, tool_error, tool_success
+from ..toolkit_lib.messages import _dumps, _loads
 
 
 logger = logging.getLogger("arc.mcp.tools")
@@ -19,6 +22,44 @@ logger.setLevel(logging.INFO)
 logger.propagate = False
 
 
+# Contract view tools touch neither session_state nor a signer, so several of
+# them requested in one turn can overlap their RPC round-trips.
+_CONCURRENT_TOOLS = frozenset(
+    name
+    for roles in (SBT_TOOL_ROLES, POOL_TOOL_ROLES)
+    for name, role in roles.items()
+    if role == "Read-only"
+)
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mcp-tool")
+
+
+def _load_arguments(args_payload: Optional[str]) -> Dict[str, Any]:
+    try:
+        return json.loads(args_payload) if args_payload else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+def _start_concurrent_reads(
+    tool_calls: list[Any], function_map: Dict[str, Any]
+) -> Dict[str, Future]:
+    """Submit a turn's read-only tool calls up front; results are consumed in order."""
+    eligible = []
+    for call in tool_calls:
+        if call.function.name not in _CONCURRENT_TOOLS or call.function.name not in function_map:
+            continue
+        arguments = _load_arguments(call.function.arguments)
+        # Non-object arguments are left to the sequential path, which reports them.
+        if isinstance(arguments, dict):
+            eligible.append((call, arguments))
+    if len(eligible) < 2:
+        return {}
+    return {
+        call.id: _TOOL_EXECUTOR.submit(function_map[call.function.name], **arguments)
+        for call, arguments in eligible
+    }
+
+
 def _truncate_output(value: str, limit: int = 800) -> str:
     if not value:
         return value or ""
@@ -39,7 +80,7 @@ def stream_chunks(stream: Iterable) -> Iterable[str]:
 def _parse_tool_output(content: Any) -> Any:
     if isinstance(content, str):
         try:
-            return json.loads(content)
+            return _loads(content)
         except json.JSONDecodeError:
             return None
     return content
@@ -87,13 +128,10 @@ def run_mcp_llm_conversation(
                     )
                 break
             messages.append(message.model_dump())
+            prefetched = _start_concurrent_reads(tool_calls, function_map)
             for tool_call in tool_calls:
                 tool_name = tool_call.function.name
-                args_payload = tool_call.function.arguments or "{}"
-                try:
-                    arguments = json.loads(args_payload) if args_payload else {}
-                except json.JSONDecodeError:
-                    arguments = {}
+                arguments = _load_arguments(tool_call.function.arguments or "{}")
 
                 logger.info(
                     "Tool call '%s' invoked with args: %s", tool_name, arguments
@@ -116,7 +154,12 @@ def run_mcp_llm_conversation(
                                     tool_name,
                                 )
                         logger.info("Tool '%s' executing...", tool_name)
-                        response_payload = handler(**arguments)
+                        future = prefetched.pop(tool_call.id, None)
+                        response_payload = (
+                            future.result()
+                            if future is not None
+                            else handler(**arguments)
+                        )
                         tool_output = (
                             response_payload
                             if isinstance(response_payload, str)
@@ -158,7 +201,7 @@ def run_mcp_llm_conversation(
                                 logger.info(
                                     "Stored transaction request for GPT-triggered MetaMask popup"
                                 )
-                                tool_output = json.dumps(parsed_response)
+                                tool_output = _dumps(parsed_response)
 
                         logger.info("Tool '%s' completed successfully", tool_name)
                     except Exception as exc:  # pragma: no cover - surfaced via UI only
@@ -199,7 +242,7 @@ def run_mcp_llm_conversation(
                         "content": tool_output,
                     }
                 )
-                render_tool_message(tool_name, tool_output)
+                render_tool_message(tool_name, tool_output, tool_call.id)
 
             if wallet_pause_requested:
                 logger.info(
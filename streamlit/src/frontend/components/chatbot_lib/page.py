@@ -10,7 +10,6 @@ from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import streamlit as st
-from web3 import Web3
 from web3.exceptions import TransactionNotFound
 
 from ..config import (
@@ -36,7 +35,7 @@ from ..toolkit import (
     render_llm_history,
 )
 from ..toolkit_lib.borrower_bridge_tools import build_borrower_bridge_toolkit
-from ..web3_utils import get_web3_client, load_contract_abi
+from ..web3_utils import checksum_address, get_web3_client, load_contract_abi
 from ..wallet_connect_component import wallet_command, connect_wallet
 from ..session import DEFAULT_SESSION_KEY
 from ..verification.verification_flow import run_verification_flow
@@ -374,7 +373,7 @@ def _update_combined_upload_payloads() -> None:
 def _guard_issue_score(handler: Callable[..., str]) -> Callable[..., str]:
     def _wrapped(*, wallet_address: str, score_value: int, **kwargs: Any) -> str:
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Wallet address is invalid.")
         entry = _get_verification_result(checksum_wallet)
@@ -884,7 +883,7 @@ def _build_chatbot_state_tools(
         if not address:
             return tool_error("No wallet address supplied or connected.")
         try:
-            checksum = Web3.to_checksum_address(address)
+            checksum = checksum_address(address)
         except ValueError:
             return tool_error("Wallet address is invalid.")
 
@@ -913,7 +912,7 @@ def _build_chatbot_state_tools(
         if not wallet_address:
             return tool_error("Wallet address is required.")
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Wallet address is invalid.")
 
@@ -1035,7 +1034,7 @@ def _build_chatbot_state_tools(
         if not wallet_address:
             return tool_error("Wallet address is required.")
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Wallet address is invalid.")
         entry = _get_verification_result(checksum_wallet)
@@ -2290,7 +2289,7 @@ def render_chatbot_page() -> None:
             else:
                 try:
                     sbt_contract = w3.eth.contract(
-                        address=Web3.to_checksum_address(sbt_address), abi=sbt_abi
+                        address=checksum_address(sbt_address), abi=sbt_abi
                     )
                     sbt_tools_schema, sbt_function_map = build_llm_toolkit(
                         w3=w3,
@@ -2309,7 +2308,7 @@ def render_chatbot_page() -> None:
         except Exception as e:
             sbt_error = f"Unexpected error loading SBT ABI: {e}"
             sbt_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(sbt_address), abi=sbt_abi
+                address=checksum_address(sbt_address), abi=sbt_abi
             )
             sbt_tools_schema, sbt_function_map = build_llm_toolkit(
                 w3=w3,
@@ -2344,7 +2343,7 @@ def render_chatbot_page() -> None:
                 usdc_abi = load_contract_abi(usdc_abi_path) if usdc_abi_path else None
                 try:
                     pool_contract = w3.eth.contract(
-                        address=Web3.to_checksum_address(pool_address), abi=pool_abi
+                        address=checksum_address(pool_address), abi=pool_abi
                     )
                     pool_tools_schema, pool_function_map = build_lending_pool_toolkit(
                         w3=w3,
@@ -2367,7 +2366,7 @@ def render_chatbot_page() -> None:
         except Exception as e:
             pool_error = f"Unexpected error loading LendingPool ABI: {e}"
             pool_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(pool_address), abi=pool_abi
+                address=checksum_address(pool_address), abi=pool_abi
             )
             pool_tools_schema, pool_function_map = build_lending_pool_toolkit(
                 w3=w3,
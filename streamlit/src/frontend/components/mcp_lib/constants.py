@@ -1,26 +1,34 @@
 from __future__ import annotations
 
+from types import MappingProxyType
+from typing import Mapping
+
 LOGGER_NAME = "arc.mcp_polygon"
 
-SBT_TOOL_ROLES = {
-    "hasSbt": "Read-only",
-    "getScore": "Read-only",
-    "issueScore": "Owner",
-    "revokeScore": "Owner",
-}
+SBT_TOOL_ROLES: Mapping[str, str] = MappingProxyType(
+    {
+        "hasSbt": "Read-only",
+        "getScore": "Read-only",
+        "getScores": "Read-only",
+        "issueScore": "Owner",
+        "revokeScore": "Owner",
+    }
+)
 
-POOL_TOOL_ROLES = {
-    "availableLiquidity": "Read-only",
-    "lenderBalance": "Read-only",
-    "getLoan": "Read-only",
-    "isBanned": "Read-only",
-    "deposit": "Lender",
-    "withdraw": "Lender",
-    "openLoan": "Owner",
-    "repay": "Borrower",
-    "checkDefaultAndBan": "Owner",
-    "unban": "Owner",
-}
+POOL_TOOL_ROLES: Mapping[str, str] = MappingProxyType(
+    {
+        "availableLiquidity": "Read-only",
+        "lenderBalance": "Read-only",
+        "getLoan": "Read-only",
+        "isBanned": "Read-only",
+        "deposit": "Lender",
+        "withdraw": "Lender",
+        "openLoan": "Owner",
+        "repay": "Borrower",
+        "checkDefaultAndBan": "Owner",
+        "unban": "Owner",
+    }
+)
 
 MCP_BRIDGE_SESSION_KEY = "mcp_cctp_bridge_state"
 MCP_ARC_TRANSFER_SESSION_KEY = "mcp_arc_transfer_state"
@@ -5,10 +5,11 @@ import os
 import mimetypes
 import logging
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import streamlit as st
 from web3 import Web3
+from web3.contract import Contract
 
 from ..config import (
     ARC_RPC_ENV,
@@ -21,7 +22,6 @@ from ..config import (
     LENDING_POOL_ADDRESS_ENV,
     LENDING_POOL_ABI_PATH_ENV,
     USDC_ADDRESS_ENV,
-    USDC_ABI_PATH_ENV,
     BRIDGE_PRIVATE_KEY_ENV,
     POLYGON_RPC_ENV,
     POLYGON_PRIVATE_KEY_ENV,
@@ -58,10 +58,17 @@ from ..web3_utils import get_web3_client, load_contract_abi
 from ..toolkit import build_llm_toolkit, build_lending_pool_toolkit, build_sbt_guard
 from ..toolkit_lib.config_utils import resolve_lending_pool_abi_path
 from ..wallet_connect_component import connect_wallet, wallet_command
-from ..web3_utils import get_web3_client, load_contract_abi
+from ..web3_utils import (
+    abi_file_mtime,
+    checksum_address,
+    get_chain_id,
+    get_web3_client,
+    load_contract_abi,
+)
 from .logging_utils import get_metamask_logger
-from .rerun import st_rerun
+from .rerun import st_fragment, st_rerun
 from .tool_runner import render_tool_runner
+from .wallet_section import _normalise_chain_id
 from .constants import (
     LOGGER_NAME,
     SBT_TOOL_ROLES,
@@ -99,6 +106,48 @@ polygon_logger.propagate = False
 METAMASK_LOGGER = get_metamask_logger()
 
 
+@st.cache_resource(show_spinner=False)
+def _cached_abi(abi_path: str, mtime_ns: int) -> Optional[list[dict[str, Any]]]:
+    return load_contract_abi(abi_path)
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_contract(
+    _w3: Web3, rpc_url: str, address: str, abi_path: str, abi_mtime_ns: int
+) -> Contract:
+    """Contract proxy per (RPC, address, ABI version); the shared client is not hashed."""
+    return _w3.eth.contract(
+        address=checksum_address(address),
+        abi=_cached_abi(abi_path, abi_mtime_ns),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_sbt_toolkit(
+    _w3: Web3,
+    _contract: Contract,
+    rpc_url: str,
+    address: str,
+    abi_path: str,
+    abi_mtime_ns: int,
+    private_key: Optional[str],
+    default_gas_limit: int,
+    gas_price_gwei: str,
+) -> Tuple[
+    list[Dict[str, Any]], Dict[str, Callable[..., str]], Callable[[str], Optional[str]]
+]:
+    """SBT tool schema, handlers and borrower guard, built once per contract and signer."""
+    tools_schema, function_map = build_llm_toolkit(
+        w3=_w3,
+        contract=_contract,
+        token_decimals=0,
+        private_key=private_key,
+        default_gas_limit=default_gas_limit,
+        gas_price_gwei=gas_price_gwei,
+    )
+    return tools_schema, function_map, build_sbt_guard(_w3, _contract)
+
+
 def _resolve_polygon_address(
     role_addresses: Dict[str, str], connected_address: Optional[str]
 ) -> Optional[str]:
@@ -111,25 +160,6 @@ def _resolve_polygon_address(
     return None
 
 
-def _normalise_chain_id(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
-        try:
-            return int(stripped, 0)
-        except ValueError:
-            try:
-                return int(stripped)
-            except ValueError:
-                return None
-    return None
-
-
 def _log_polygon_event(
     message: str, logs: list[str], *, level: str = "info"
 ) -> list[str]:
@@ -246,12 +276,46 @@ def _render_cctp_bridge_section(
         else:
             st.markdown("**Polygon auto-mint:** disabled (manual mint required)")
 
-    st.markdown("### ARC Same-Chain Transfer")
+    _render_arc_transfer_fragment(
+        default_arc_recipient=default_arc_recipient,
+        arc_rpc_url=arc_rpc_url,
+        lending_pool_address=lending_pool_address,
+        abi_path=abi_path,
+        private_key=private_key,
+        gas_limit=gas_limit,
+        gas_price_wei=gas_price_wei,
+    )
+    _render_cctp_bridge_fragment(
+        default_polygon=default_polygon,
+        arc_rpc_url=arc_rpc_url,
+        lending_pool_address=lending_pool_address,
+        abi_path=abi_path,
+        private_key=private_key,
+        gas_limit=gas_limit,
+        gas_price_wei=gas_price_wei,
+        polygon_rpc_url=polygon_rpc_url,
+        polygon_private_key=polygon_private_key,
+    )
+
+
+@st_fragment
+def _render_arc_transfer_fragment(
+    *,
+    default_arc_recipient: str,
+    arc_rpc_url: Optional[str],
+    lending_pool_address: Optional[str],
+    abi_path: Optional[str],
+    private_key: Optional[str],
+    gas_limit: Optional[int],
+    gas_price_wei: Optional[int],
+) -> None:
+    """ARC same-chain transfer form; reruns stay scoped to this fragment."""
     transfer_state: Optional[Dict[str, Any]] = st.session_state.get(
         MCP_ARC_TRANSFER_SESSION_KEY
     )
+    st.markdown("### ARC Same-Chain Transfer")
 
-    with st.form("mcp_arc_transfer_form"):
+    with st.form("mcp_arc_transfer_form", clear_on_submit=True):
         recipient_input = st.text_input(
             "ARC recipient address",
             value=default_arc_recipient,
@@ -264,6 +328,7 @@ def _render_cctp_bridge_section(
 
     if submitted_arc:
         st.session_state.pop(MCP_ARC_TRANSFER_SESSION_KEY, None)
+        transfer_state = None
         arc_logs: list[str] = []
         try:
             with st.spinner("Broadcasting ARC transfer…"):
@@ -295,7 +360,6 @@ def _render_cctp_bridge_section(
                 with st.expander("ARC transfer log", expanded=True):
                     st.code("\n".join(arc_logs), language="text")
 
-    transfer_state = st.session_state.get(MCP_ARC_TRANSFER_SESSION_KEY)
     if transfer_state:
         st.markdown(
             f"**Transaction hash:** [`{transfer_state['transfer_tx_hash']}`]"
@@ -307,6 +371,24 @@ def _render_cctp_bridge_section(
     else:
         st.info("Submit the form above to transfer USDC between ARC wallets.")
 
+
+@st_fragment
+def _render_cctp_bridge_fragment(
+    *,
+    default_polygon: Optional[str],
+    arc_rpc_url: Optional[str],
+    lending_pool_address: Optional[str],
+    abi_path: Optional[str],
+    private_key: Optional[str],
+    gas_limit: Optional[int],
+    gas_price_wei: Optional[int],
+    polygon_rpc_url: Optional[str],
+    polygon_private_key: Optional[str],
+) -> None:
+    """CCTP bridge + Polygon mint flow; reruns stay scoped to this fragment."""
+    bridge_state: Optional[Dict[str, Any]] = st.session_state.get(
+        MCP_BRIDGE_SESSION_KEY
+    )
     st.markdown("### Circle CCTP Bridge (ARC → Other Chains)")
     st.caption(
         "Use this section only for cross-chain transfers from ARC via Circle CCTP."
@@ -324,13 +406,9 @@ def _render_cctp_bridge_section(
         )
         return
 
-    bridge_state: Optional[Dict[str, Any]] = st.session_state.get(
-        MCP_BRIDGE_SESSION_KEY
-    )
-
     bridge_status_box = st.empty()
 
-    with st.form("mcp_cctp_bridge_form"):
+    with st.form("mcp_cctp_bridge_form", clear_on_submit=True):
         amount_input = st.text_input(
             "Amount to bridge (USDC)", value="0.10", key="mcp_cctp_amount"
         )
@@ -338,6 +416,7 @@ def _render_cctp_bridge_section(
 
     if submitted_bridge:
         st.session_state.pop(MCP_BRIDGE_SESSION_KEY, None)
+        bridge_state = None
         bridge_logs: list[str] = []
         bridge_status_box.info(
             "Submitting bridge transactions… Circle usually needs a few minutes to finalise the attestation."
@@ -395,7 +474,6 @@ def _render_cctp_bridge_section(
                 with st.expander("Bridge log", expanded=True):
                     st.code("\n".join(bridge_logs), language="text")
 
-    bridge_state = st.session_state.get(MCP_BRIDGE_SESSION_KEY)
     if not bridge_state:
         st.info(
             "Once the burn transaction completes, this section will prepare the Polygon mint transaction."
@@ -946,11 +1024,7 @@ def _render_verification_section() -> None:
     # Get chain_id for wallet connection (same as used in role assignment)
     rpc_url = os.getenv(ARC_RPC_ENV)
     w3 = get_web3_client(rpc_url)
-    chain_id = None
-    try:
-        chain_id = w3.eth.chain_id if w3 else None
-    except Exception:
-        chain_id = None
+    chain_id = get_chain_id(w3)
 
     # Connect to MetaMask wallet
     wallet_info = connect_wallet(
@@ -1277,11 +1351,7 @@ def render_mcp_tools_page() -> None:
 
     w3 = get_web3_client(rpc_url)
 
-    chain_id = None
-    try:
-        chain_id = w3.eth.chain_id if w3 else None
-    except Exception:
-        chain_id = None
+    chain_id = get_chain_id(w3)
 
     roles_key = "role_addresses"
     role_addresses: Dict[str, str] = (
@@ -1403,20 +1473,25 @@ def render_mcp_tools_page() -> None:
         sbt_function_map = {}
         sbt_guard = None
         if sbt_address and sbt_abi_path and w3 is not None:
-            sbt_abi = load_contract_abi(sbt_abi_path)
             try:
-                sbt_contract = w3.eth.contract(
-                    address=Web3.to_checksum_address(sbt_address), abi=sbt_abi
+                sbt_contract = _cached_contract(
+                    w3,
+                    rpc_url,
+                    sbt_address,
+                    sbt_abi_path,
+                    abi_file_mtime(sbt_abi_path),
                 )
-                sbt_tools_schema, sbt_function_map = build_llm_toolkit(
-                    w3=w3,
-                    contract=sbt_contract,
-                    token_decimals=0,
-                    private_key=owner_pk,
-                    default_gas_limit=default_gas_limit,
-                    gas_price_gwei=gas_price_gwei,
+                sbt_tools_schema, sbt_function_map, sbt_guard = _cached_sbt_toolkit(
+                    w3,
+                    sbt_contract,
+                    rpc_url,
+                    sbt_address,
+                    sbt_abi_path,
+                    abi_file_mtime(sbt_abi_path),
+                    owner_pk,
+                    default_gas_limit,
+                    gas_price_gwei,
                 )
-                sbt_guard = build_sbt_guard(w3, sbt_contract)
             except Exception as exc:
                 st.warning(f"Unable to build SBT toolkit: {exc}")
 
@@ -1441,17 +1516,18 @@ def render_mcp_tools_page() -> None:
         pool_address = os.getenv(LENDING_POOL_ADDRESS_ENV)
         pool_abi_path = os.getenv(LENDING_POOL_ABI_PATH_ENV)
         usdc_address = os.getenv(USDC_ADDRESS_ENV)
-        usdc_abi_path = os.getenv(USDC_ABI_PATH_ENV)
         usdc_decimals = int(os.getenv(USDC_DECIMALS_ENV, "6"))
 
         pool_tools_schema = []
         pool_function_map = {}
         if pool_address and pool_abi_path and w3 is not None:
-            pool_abi = load_contract_abi(pool_abi_path)
-            usdc_abi = load_contract_abi(usdc_abi_path) if usdc_abi_path else None
             try:
-                pool_contract = w3.eth.contract(
-                    address=Web3.to_checksum_address(pool_address), abi=pool_abi
+                pool_contract = _cached_contract(
+                    w3,
+                    rpc_url,
+                    pool_address,
+                    pool_abi_path,
+                    abi_file_mtime(pool_abi_path),
                 )
                 pool_tools_schema, pool_function_map = build_lending_pool_toolkit(
                     w3=w3,
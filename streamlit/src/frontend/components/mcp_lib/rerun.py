@@ -1,13 +1,53 @@
 from __future__ import annotations
 
+from typing import Any, Callable, TypeVar
+
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
 
+def st_rerun(scope: str = "app") -> None:
+    """Rerun the app, or only the enclosing fragment when ``scope="fragment"``.
+
+    Falls back to a full rerun on builds without fragment-scoped reruns or when
+    called outside a fragment.
+    """
 
-def st_rerun() -> None:
     rerun = getattr(st, "rerun", None)
     if callable(rerun):
+        if scope != "app":
+            try:
+                rerun(scope=scope)
+            except (TypeError, StreamlitAPIException):
+                pass
+            else:
+                return
         rerun()
         return
     legacy = getattr(st, "experimental_rerun", None)
     if callable(legacy):
         legacy()
+
+
+def in_fragment_run() -> bool:
+    """True when the current script run was triggered for a fragment only."""
+
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return False
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and getattr(ctx, "fragment_ids_this_run", None))
+
+
+def st_fragment(func: _F) -> _F:
+    """Scope widget reruns to ``func`` when the Streamlit build supports fragments."""
+
+    fragment = getattr(st, "fragment", None) or getattr(
+        st, "experimental_fragment", None
+    )
+    if callable(fragment):
+        return fragment(func)
+    return func
@@ -1,39 +1,237 @@
 from __future__ import annotations
 
-import json
-from time import time
-from typing import Any, Callable, Dict, Optional
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 import streamlit as st
 from web3 import Web3
 
-from ..session import DEFAULT_SESSION_KEY
+from ..toolkit_lib.messages import _dumps, _loads
 from ..wallet_connect_component import wallet_command
+from ..web3_utils import get_chain_id
 from .logging_utils import get_metamask_logger
-from .rerun import st_rerun
-from .wallet_section import render_wallet_section
+from .rerun import st_fragment, st_rerun
+from .wallet_section import (
+    _get_default_wallet_dict,
+    _next_sequence,
+    _normalise_chain_id,
+    _normalise_payload_chain,
+    _tool_context,
+    render_wallet_section,
+)
 
 
 METAMASK_LOGGER = get_metamask_logger()
 
+# Results beyond either bound render collapsed with a download link; lists longer
+# than RESULT_PAGE_SIZE are paged.
+LARGE_RESULT_CHARS = 100_000
+LARGE_RESULT_ITEMS = 500
+RECENT_LOG_WINDOW = 8
+RESULT_PAGE_SIZE = 50
 
-def _normalise_chain_id(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
-        try:
-            return int(stripped, 0)
-        except ValueError:
-            try:
-                return int(stripped)
-            except ValueError:
-                return None
-    return None
+
+@dataclass
+class _LogBuffer:
+    """MetaMask log lines collected during one rerun, flushed in a single write."""
+
+    logs: Deque[str]
+    recent: OrderedDict[int, None]
+    pending: list[str] = field(default_factory=list)
+
+    def add(self, message: str) -> None:
+        # Dedup against a short window so flapping status lines are logged once.
+        text = str(message)
+        digest = hash(text)
+        if digest in self.recent:
+            return
+        self.recent[digest] = None
+        if len(self.recent) > RECENT_LOG_WINDOW:
+            self.recent.popitem(last=False)
+        self.pending.append(text)
+
+    def flush(self) -> bool:
+        if not self.pending:
+            return False
+        self.logs.extend(self.pending)
+        self.pending.clear()
+        return True
+
+
+class _ToolRoleFlags(NamedTuple):
+    required_role: Optional[str]
+    requires_signature_role: bool
+    has_env_signer: bool
+    requires_metamask_wallet: bool
+    role_address: Optional[str]
+
+
+_NO_ROLE_FLAGS = _ToolRoleFlags(None, False, False, False, None)
+
+
+@st.cache_data(show_spinner=False)
+def _tool_role_flags(
+    role_map_items: Tuple[Tuple[str, str], ...],
+    signer_presence_items: Tuple[Tuple[str, bool], ...],
+    role_address_items: Tuple[Tuple[str, str], ...],
+) -> Dict[str, _ToolRoleFlags]:
+    """Signing requirements per tool name, resolved once per role configuration."""
+    tool_role_map = dict(role_map_items)
+    signer_presence = dict(signer_presence_items)
+    role_addresses = dict(role_address_items)
+    flags: Dict[str, _ToolRoleFlags] = {}
+    for tool_name, role in tool_role_map.items():
+        requires_signature_role = bool(role and role != "Read-only")
+        has_env_signer = bool(signer_presence.get(role)) if role else False
+        flags[tool_name] = _ToolRoleFlags(
+            required_role=role,
+            requires_signature_role=requires_signature_role,
+            has_env_signer=has_env_signer,
+            requires_metamask_wallet=requires_signature_role and not has_env_signer,
+            role_address=role_addresses.get(role) if role else None,
+        )
+    return flags
+
+
+@st.cache_data(show_spinner=False)
+def _derive_tool_index(
+    key_prefix: str,
+    tool_names_key: Tuple[str, ...],
+    role_map_items: Tuple[Tuple[str, str], ...],
+    _tools_schema: list[Dict[str, Any]],
+) -> Tuple[list[str], Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """Selectbox labels, label -> tool name, and tool name -> schema for a toolkit.
+
+    A toolkit's schema is fixed by code, so its tool names identify it and the
+    schema itself is left out of the cache key.
+    """
+    tool_role_map = dict(role_map_items)
+    tool_names = []
+    display_names = []
+    schema_by_name: Dict[str, Dict[str, Any]] = {}
+    for entry in _tools_schema:
+        name = entry["function"]["name"]
+        tool_names.append(name)
+        schema_by_name.setdefault(name, entry)
+        role_label = tool_role_map.get(name)
+        if role_label and role_label != "Read-only":
+            display_names.append(f"{name} [{role_label}]")
+        else:
+            display_names.append(name)
+    selection_map = dict(zip(display_names, tool_names))
+    return display_names, selection_map, schema_by_name
+
+
+def _integer_input(label: str, default: Any, key: str) -> int:
+    return int(st.number_input(label, value=int(default or 0), step=1, key=key))
+
+
+def _number_input(label: str, default: Any, key: str) -> float:
+    return float(st.number_input(label, value=float(default or 0), key=key))
+
+
+def _boolean_input(label: str, default: Any, key: str) -> bool:
+    return st.checkbox(
+        label, value=bool(default) if default is not None else False, key=key
+    )
+
+
+def _array_default(default: Any) -> str:
+    return ", ".join(default) if isinstance(default, list) else ""
+
+
+def _array_input(label: str, default: Any, key: str) -> list[str]:
+    # Schema defaults arrive pre-joined from the compiled plan.
+    raw = st.text_area(
+        f"{label} (comma separated)",
+        value=default if isinstance(default, str) else _array_default(default),
+        key=key,
+    )
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+def _text_input(label: str, default: Any, key: str) -> str:
+    return st.text_input(
+        label, value=str(default) if default is not None else "", key=key
+    )
+
+
+_INPUT_WIDGETS: Mapping[str, Callable[[str, Any, str], Any]] = MappingProxyType(
+    {
+        "integer": _integer_input,
+        "number": _number_input,
+        "boolean": _boolean_input,
+        "array": _array_input,
+    }
+)
+
+
+@st.cache_resource(show_spinner=False)
+def _compile_input_renderer(
+    key_prefix: str, tool_name: str, _schema: Dict[str, Any]
+) -> Callable[[str, str, Dict[str, Dict[str, Any]] | None], Dict[str, Any]]:
+    """Resolve each parameter's widget once per tool; the renderer just walks the plan."""
+    properties = _schema["function"].get("parameters", {}).get("properties", {})
+    plan = []
+    for name, details in properties.items():
+        widget = _INPUT_WIDGETS.get(details.get("type", "string"), _text_input)
+        default = details.get("default")
+        if widget is _array_input:
+            default = _array_default(default)
+        plan.append(
+            (name, f"{name} ({details.get('type', 'string')})", default, widget)
+        )
+    # Widget keys per (key_prefix, selected), formatted on first render only.
+    widget_keys: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+    def render_inputs(
+        selected: str,
+        key_prefix: str,
+        parameter_defaults: Dict[str, Dict[str, Any]] | None,
+    ) -> Dict[str, Any]:
+        overrides = (parameter_defaults or {}).get(selected, {})
+        keys = widget_keys.get((key_prefix, selected))
+        if keys is None:
+            keys = tuple(f"{key_prefix}_param_{selected}_{entry[0]}" for entry in plan)
+            widget_keys[(key_prefix, selected)] = keys
+        return {
+            name: widget(label, overrides.get(name, default), key)
+            for (name, label, default, widget), key in zip(plan, keys)
+        }
+
+    return render_inputs
+
+
+@st_fragment
+def _render_result_pages(items: list[Any], key: str) -> None:
+    """Show a long list result one page at a time; paging reruns only this fragment."""
+    total = len(items)
+    pages = -(-total // RESULT_PAGE_SIZE)
+    page = int(
+        st.number_input(
+            f"Result page (1-{pages})",
+            min_value=1,
+            max_value=pages,
+            value=1,
+            step=1,
+            key=key,
+        )
+    )
+    start = (page - 1) * RESULT_PAGE_SIZE
+    end = min(start + RESULT_PAGE_SIZE, total)
+    st.caption(f"Showing entries {start + 1}-{end} of {total}.")
+    st.json(items[start:end])
 
 
 def render_tool_runner(
@@ -45,42 +243,45 @@ def render_tool_runner(
     *,
     role_private_keys: Dict[str, Optional[str]] | None = None,
     role_addresses: Dict[str, str] | None = None,
-    tool_role_map: Dict[str, str] | None = None,
+    tool_role_map: Mapping[str, str] | None = None,
 ) -> None:
+    default_wallet = _get_default_wallet_dict()
+
     st.subheader("Run a tool")
 
     if not tools_schema:
         st.info("No MCP tools available. Check contract addresses and ABI paths.")
         return
 
-    tool_names = [entry["function"]["name"] for entry in tools_schema]
-    display_names = []
-    for name in tool_names:
-        role_label = (tool_role_map or {}).get(name)
-        if role_label and role_label != "Read-only":
-            display_names.append(f"{name} [{role_label}]")
-        else:
-            display_names.append(name)
-    selection_map = dict(zip(display_names, tool_names))
+    role_map_items = tuple(sorted((tool_role_map or {}).items()))
+    display_names, selection_map, schema_by_name = _derive_tool_index(
+        key_prefix,
+        tuple(entry["function"]["name"] for entry in tools_schema),
+        role_map_items,
+        tools_schema,
+    )
     selected_display = st.selectbox(
         "Choose a tool", display_names, key=f"{key_prefix}_tool_select"
     )
     selected = selection_map[selected_display]
 
-    required_role = (tool_role_map or {}).get(selected)
-    role_private_keys = role_private_keys or {}
-    requires_signature_role = bool(required_role and required_role != "Read-only")
-    has_env_signer = (
-        bool(role_private_keys.get(required_role)) if required_role else False
-    )
-    requires_metamask_wallet = requires_signature_role and not has_env_signer
+    # Only signer presence is hashed into the cache key, never the keys themselves.
+    role_flags = _tool_role_flags(
+        role_map_items,
+        tuple(
+            sorted((role, bool(pk)) for role, pk in (role_private_keys or {}).items())
+        ),
+        tuple(sorted((role_addresses or {}).items())),
+    ).get(selected, _NO_ROLE_FLAGS)
+    required_role = role_flags.required_role
+    requires_signature_role = role_flags.requires_signature_role
+    requires_metamask_wallet = role_flags.requires_metamask_wallet
     if required_role:
         if required_role == "Read-only":
             st.caption("This call is read-only and does not require a signature.")
         else:
-            pk_available = bool(role_private_keys.get(required_role))
-            addr = (role_addresses or {}).get(required_role)
-            if pk_available:
+            addr = role_flags.role_address
+            if role_flags.has_env_signer:
                 st.caption(
                     f"Signing will use the {required_role} private key from .env."
                 )
@@ -93,489 +294,453 @@ def render_tool_runner(
                     f"No private key or MetaMask wallet configured for role '{required_role}'."
                 )
 
-    mm_state_key = f"mm_state_{key_prefix}_{selected}"
-    try:
-        expected_chain_id = _normalise_chain_id(w3.eth.chain_id)
-    except Exception:
-        expected_chain_id = None
-
-    log_key = f"mcp_tool_logs_{key_prefix}_{selected}"
-    stored_logs = st.session_state.get(log_key)
-    tool_logs: list[str] = stored_logs if isinstance(stored_logs, list) else []
-
-    log_cols = st.columns([4, 1])
-    with log_cols[0]:
-        log_placeholder = st.empty()
-    with log_cols[1]:
-        clear_log_clicked = st.button(
-            "Clear MetaMask log",
-            key=f"{key_prefix}_clear_log_{selected}",
-            help="Reset network log for this tool.",
-        )
+    tool_ctx = _tool_context(key_prefix, selected)
+    expected_chain_id = get_chain_id(w3)
+    expected_hex = (
+        f"0x{expected_chain_id:x}" if expected_chain_id is not None else "unknown"
+    )
+
+    tool_logs: Deque[str] = tool_ctx["logs"]
+
+    # Read-only tools never touch MetaMask, so they get no network log either.
+    log_placeholder: Optional[Any] = None
+    clear_log_clicked = False
+    if requires_signature_role:
+        log_cols = st.columns([4, 1])
+        with log_cols[0]:
+            log_placeholder = st.empty()
+        with log_cols[1]:
+            clear_log_clicked = st.button(
+                "Clear MetaMask log",
+                key=f"{key_prefix}_clear_log_{selected}",
+                help="Reset network log for this tool.",
+            )
+
+    last_render: list[Optional[str]] = [None]
 
     def _render_logs() -> None:
-        if tool_logs:
-            log_placeholder.code("\n".join(tool_logs[-40:]), language="text")
+        if log_placeholder is None:
+            return
+        # Skip the placeholder update when the visible log text is unchanged.
+        payload = "\n".join(tool_logs)
+        if payload == last_render[0]:
+            return
+        last_render[0] = payload
+        if payload:
+            log_placeholder.code(payload, language="text")
         else:
             log_placeholder.info("No MetaMask network events yet.")
 
     if clear_log_clicked:
-        st.session_state.pop(log_key, None)
-        tool_logs = []
+        tool_logs = tool_ctx["logs"] = deque(maxlen=40)
+        tool_ctx["recent_logs"] = OrderedDict()
 
     _render_logs()
 
-    def _append_log(message: str) -> None:
-        text = str(message)
-        if not tool_logs or tool_logs[-1] != text:
-            tool_logs.append(text)
-            st.session_state[log_key] = tool_logs
-        _render_logs()
-
-    if expected_chain_id is None:
-        _append_log(
-            "⚠ Unable to determine ARC chain ID from RPC; MetaMask network enforcement may be limited."
-        )
-
-    existing_state = st.session_state.get(mm_state_key)
-    mm_state: Dict[str, Any] = (
-        existing_state if isinstance(existing_state, dict) else {}
-    )
-    mm_state_chain_id: Optional[int] = None
-    if mm_state:
-        mm_state_chain_id = _normalise_chain_id(mm_state.get("wallet_chain"))
-        if mm_state_chain_id is None:
-            last_result = mm_state.get("last_result")
-            if isinstance(last_result, dict):
-                mm_state_chain_id = _normalise_chain_id(last_result.get("chainId"))
-        if mm_state_chain_id is None:
-            last_value = mm_state.get("last_value")
-            if isinstance(last_value, dict):
-                mm_state_chain_id = _normalise_chain_id(last_value.get("chainId"))
-
-    session_chain_id: Optional[int] = None
-    cached_wallet = st.session_state.get(DEFAULT_SESSION_KEY)
-    if isinstance(cached_wallet, dict):
-        session_chain_id = _normalise_chain_id(cached_wallet.get("chainId"))
-        preferred_address = cached_wallet.get("address")
-    else:
-        preferred_address = None
-
-    current_chain_id = mm_state_chain_id or session_chain_id
-    auto_switch_state_key = f"mm_auto_switch_{key_prefix}_{selected}"
-    auto_switch_state = st.session_state.get(auto_switch_state_key)
-    if not isinstance(auto_switch_state, dict):
-        auto_switch_state = {}
-
-    status_payload = wallet_command(
-        key=f"wallet_status_probe_{key_prefix}_{selected}",
-        command=None,
-        require_chain_id=expected_chain_id,
-        preferred_address=str(preferred_address) if preferred_address else None,
-        autoconnect=True,
+    # Lines are buffered for the whole rerun and appended to the tool log once.
+    log_buffer = _LogBuffer(
+        tool_logs, tool_ctx.setdefault("recent_logs", OrderedDict())
     )
+    _append_log = log_buffer.add
 
-    if isinstance(status_payload, dict):
-        mm_state.setdefault("last_value", status_payload)
-        payload_chain = _normalise_chain_id(status_payload.get("chainId"))
-        payload_status = status_payload.get("status")
-        payload_warning = status_payload.get("warning")
-        payload_error = status_payload.get("error")
-        if payload_chain is not None:
-            current_chain_id = payload_chain
-            mm_state["wallet_chain"] = payload_chain
-            st.session_state[mm_state_key] = mm_state
-            st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-            if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                st.session_state[DEFAULT_SESSION_KEY]["chainId"] = payload_chain
-        if payload_error:
-            _append_log(f"✖ MetaMask error: {payload_error}")
-        elif payload_warning:
-            _append_log(f"! MetaMask warning: {payload_warning}")
-        elif payload_status:
-            _append_log(f"(info) MetaMask status: {payload_status}")
-        if expected_chain_id is not None and payload_chain is not None:
-            if payload_chain == expected_chain_id:
-                _append_log(
-                    f"✔ Wallet connected to ARC chain {expected_chain_id} (0x{expected_chain_id:x})."
-                )
-            else:
+    try:
+        existing_state: Dict[str, Any] = tool_ctx["mm"]
+        mm_state = existing_state
+        # Only tools that need a signature coordinate with MetaMask; read-only
+        # calls skip the wallet probe and network checks entirely.
+        if requires_signature_role:
+            if expected_chain_id is None:
                 _append_log(
-                    f"⚠ Wallet is on chain {payload_chain} (0x{payload_chain:x}); expecting ARC {expected_chain_id} (0x{expected_chain_id:x})."
+                    "⚠ Unable to determine ARC chain ID from RPC; MetaMask network enforcement may be limited."
                 )
-    elif status_payload is not None:
-        _append_log(f"(info) MetaMask payload: {status_payload}")
-
-    connected_address = mm_state.get("wallet_address")
-    if not connected_address and isinstance(status_payload, dict):
-        candidate_address = status_payload.get("address")
-        if candidate_address:
-            connected_address = str(candidate_address)
-            mm_state["wallet_address"] = connected_address
-            st.session_state[mm_state_key] = mm_state
-            st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-            if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                st.session_state[DEFAULT_SESSION_KEY]["address"] = connected_address
-    wallet_connected = bool(connected_address)
-
-    auto_connect_state_key = f"mm_auto_connect_{key_prefix}_{selected}"
-    auto_connect_state = st.session_state.get(auto_connect_state_key)
-    if not isinstance(auto_connect_state, dict):
-        auto_connect_state = {}
-
-    connect_button_key = f"{key_prefix}_connect_wallet_{selected}"
-    pending_connect = bool(auto_connect_state.get("pending"))
-    connect_sequence = auto_connect_state.get("sequence")
-    if pending_connect and not auto_connect_state.get("logged"):
-        stored_reason = (
-            auto_connect_state.get("reason")
-            or "MetaMask connection command pending (restored state)."
-        )
-        METAMASK_LOGGER.info(
-            "MetaMask popup (connect) for MCP tool '%s'. Reason: %s.",
-            selected,
-            stored_reason,
-        )
-        auto_connect_state["logged"] = True
-        st.session_state[auto_connect_state_key] = auto_connect_state
 
-    if requires_metamask_wallet and not wallet_connected:
-        st.warning(
-            "Connect your MetaMask wallet to continue. If a provider selection window appears, choose MetaMask."
-        )
-        if not pending_connect:
-            if st.button("Connect MetaMask", key=connect_button_key):
-                connect_sequence = int(time() * 1000)
-                reason = (
-                    f"role '{required_role}' requires MetaMask signer"
-                    if required_role
-                    else "tool requires MetaMask signer"
-                )
-                auto_connect_state = {
-                    "attempted": True,
-                    "pending": True,
-                    "sequence": connect_sequence,
-                    "reason": reason,
-                    "logged": False,
-                }
-                st.session_state[auto_connect_state_key] = auto_connect_state
-                pending_connect = True
-                _append_log(
-                    "⚠ Requesting MetaMask connection. Approve the request in MetaMask."
+            mm_state_chain_id: Optional[int] = None
+            if mm_state:
+                # Chain ids are normalised when written into mm_state, so plain reads here.
+                mm_state_chain_id = mm_state.get("wallet_chain")
+                if mm_state_chain_id is None:
+                    last_result = mm_state.get("last_result")
+                    if isinstance(last_result, dict):
+                        mm_state_chain_id = last_result.get("chainId")
+                if mm_state_chain_id is None:
+                    last_value = mm_state.get("last_value")
+                    if isinstance(last_value, dict):
+                        mm_state_chain_id = last_value.get("chainId")
+
+            session_chain_id = _normalise_chain_id(default_wallet.get("chainId"))
+            preferred_address = default_wallet.get("address")
+
+            current_chain_id = mm_state_chain_id or session_chain_id
+            auto_switch_state: Dict[str, Any] = tool_ctx["auto_switch"]
+            auto_connect_state: Dict[str, Any] = tool_ctx["auto_connect"]
+
+            pending_connect = bool(auto_connect_state.get("pending"))
+            connect_sequence = auto_connect_state.get("sequence")
+            pending_switch = bool(auto_switch_state.get("pending"))
+            switch_sequence = auto_switch_state.get("sequence")
+
+            # The status probe carries at most one pending command so each rerun costs
+            # a single component round trip; connect takes priority over a switch.
+            pending_command: Optional[str] = None
+            pending_sequence: Optional[int] = None
+            pending_payload: Optional[Dict[str, Any]] = None
+            if pending_connect and connect_sequence is not None:
+                pending_command, pending_sequence = "connect", connect_sequence
+            elif pending_switch and switch_sequence is not None:
+                pending_command, pending_sequence = "switch_network", switch_sequence
+                if expected_chain_id is not None:
+                    pending_payload = {"require_chain_id": expected_chain_id}
+
+            wallet_response = wallet_command(
+                key=f"wallet_status_probe_{key_prefix}_{selected}",
+                command=pending_command,
+                command_sequence=pending_sequence,
+                command_payload=pending_payload,
+                require_chain_id=expected_chain_id,
+                preferred_address=str(preferred_address) if preferred_address else None,
+                autoconnect=True,
+                include_status=True,
+            )
+            status_payload = _normalise_payload_chain(wallet_response["status"])
+            command_result: Optional[Dict[str, Any]] = _normalise_payload_chain(
+                wallet_response["command_result"]
+            )
+
+            if isinstance(status_payload, dict):
+                mm_state.setdefault("last_value", status_payload)
+                payload_chain = status_payload.get("chainId")
+                payload_status = status_payload.get("status")
+                payload_warning = status_payload.get("warning")
+                payload_error = status_payload.get("error")
+                if payload_chain is not None:
+                    current_chain_id = payload_chain
+                    mm_state["wallet_chain"] = payload_chain
+                    default_wallet["chainId"] = payload_chain
+                if payload_error:
+                    _append_log(f"✖ MetaMask error: {payload_error}")
+                elif payload_warning:
+                    _append_log(f"! MetaMask warning: {payload_warning}")
+                elif payload_status:
+                    _append_log(f"(info) MetaMask status: {payload_status}")
+                if expected_chain_id is not None and payload_chain is not None:
+                    if payload_chain == expected_chain_id:
+                        _append_log(
+                            f"✔ Wallet connected to ARC chain {expected_chain_id} ({expected_hex})."
+                        )
+                    else:
+                        _append_log(
+                            f"⚠ Wallet is on chain {payload_chain} (0x{payload_chain:x}); expecting ARC {expected_chain_id} ({expected_hex})."
+                        )
+            elif status_payload is not None:
+                _append_log(f"(info) MetaMask payload: {status_payload}")
+
+            connected_address = mm_state.get("wallet_address")
+            if not connected_address and isinstance(status_payload, dict):
+                candidate_address = status_payload.get("address")
+                if candidate_address:
+                    connected_address = str(candidate_address)
+                    mm_state["wallet_address"] = connected_address
+                    default_wallet["address"] = connected_address
+            wallet_connected = bool(connected_address)
+
+            connect_button_key = f"{key_prefix}_connect_wallet_{selected}"
+            if pending_connect and not auto_connect_state.get("logged"):
+                stored_reason = (
+                    auto_connect_state.get("reason")
+                    or "MetaMask connection command pending (restored state)."
                 )
                 METAMASK_LOGGER.info(
                     "MetaMask popup (connect) for MCP tool '%s'. Reason: %s.",
                     selected,
-                    reason,
+                    stored_reason,
                 )
                 auto_connect_state["logged"] = True
-                st.session_state[auto_connect_state_key] = auto_connect_state
-        else:
-            st.info("Waiting for MetaMask connection…")
-    else:
-        if auto_connect_state_key in st.session_state:
-            st.session_state.pop(auto_connect_state_key, None)
-        pending_connect = False
-        connect_sequence = None
-
-    if pending_connect and connect_sequence is not None:
-        connect_payload = wallet_command(
-            key=f"wallet_auto_connect_{key_prefix}_{selected}",
-            command="connect",
-            command_sequence=connect_sequence,
-            require_chain_id=expected_chain_id,
-            preferred_address=str(preferred_address) if preferred_address else None,
-            autoconnect=True,
-        )
-        if isinstance(connect_payload, dict):
-            _append_log(f"(info) MetaMask payload: {connect_payload}")
-            if connect_payload.get("commandSequence") == connect_sequence:
-                auto_connect_state["pending"] = False
-                st.session_state[auto_connect_state_key] = auto_connect_state
-            payload_error = connect_payload.get("error")
-            payload_status = str(connect_payload.get("status") or "").lower()
-            payload_address = connect_payload.get("address")
-            payload_chain = _normalise_chain_id(connect_payload.get("chainId"))
-            if payload_address:
-                connected_address = str(payload_address)
-                wallet_connected = True
-                mm_state["wallet_address"] = connected_address
-                st.session_state[mm_state_key] = mm_state
-                st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-                if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                    st.session_state[DEFAULT_SESSION_KEY]["address"] = connected_address
-            if payload_chain is not None:
-                current_chain_id = payload_chain
-                mm_state["wallet_chain"] = payload_chain
-                st.session_state[mm_state_key] = mm_state
-                st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-                if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                    st.session_state[DEFAULT_SESSION_KEY]["chainId"] = payload_chain
-            if payload_error:
-                _append_log(f"✖ MetaMask connection error: {payload_error}")
-            elif payload_status == "connected":
-                _append_log("✔ MetaMask connected. Checking network…")
-                st.session_state.pop(auto_connect_state_key, None)
-            elif payload_status:
-                _append_log(f"(info) MetaMask status: {payload_status}")
-        elif connect_payload is not None:
-            _append_log(f"(info) MetaMask payload: {connect_payload}")
-
-    if current_chain_id is None:
-        current_chain_id = _normalise_chain_id(mm_state.get("wallet_chain"))
-    if current_chain_id is None and isinstance(status_payload, dict):
-        current_chain_id = _normalise_chain_id(status_payload.get("chainId"))
-    chain_mismatch = (
-        requires_metamask_wallet
-        and expected_chain_id is not None
-        and current_chain_id is not None
-        and current_chain_id != expected_chain_id
-    )
+                tool_ctx["auto_connect"] = auto_connect_state
 
-    switch_button_key = f"{key_prefix}_switch_network_{selected}"
-    pending_switch = bool(auto_switch_state.get("pending"))
-    switch_sequence = auto_switch_state.get("sequence")
-    if pending_switch and not auto_switch_state.get("logged"):
-        stored_reason = (
-            auto_switch_state.get("reason")
-            or "MetaMask network switch pending (restored state)."
-        )
-        METAMASK_LOGGER.info(
-            "MetaMask popup (switch_network) for MCP tool '%s'. Reason: %s.",
-            selected,
-            stored_reason,
-        )
-        auto_switch_state["logged"] = True
-        st.session_state[auto_switch_state_key] = auto_switch_state
-
-    if wallet_connected and chain_mismatch:
-        required_hex = (
-            f"0x{expected_chain_id:x}" if expected_chain_id is not None else "unknown"
-        )
-        actual_hex = (
-            f"0x{current_chain_id:x}" if current_chain_id is not None else "unknown"
-        )
-        st.error(
-            f"Wallet is connected to chain {current_chain_id} ({actual_hex}); switch to ARC chain {expected_chain_id} ({required_hex}) before running MCP tools."
-        )
-        st.caption(
-            "MetaMask should prompt for a network change. Approve the switch to continue."
-        )
-        if not pending_switch:
-            if st.button("Switch MetaMask to ARC", key=switch_button_key):
-                switch_sequence = int(time() * 1000)
-                reason = (
-                    f"wallet on chain {current_chain_id}; expected {expected_chain_id}"
-                    if expected_chain_id is not None and current_chain_id is not None
-                    else "wallet network mismatch"
+            if requires_metamask_wallet and not wallet_connected:
+                st.warning(
+                    "Connect your MetaMask wallet to continue. If a provider selection window appears, choose MetaMask."
                 )
-                auto_switch_state = {
-                    "attempted": True,
-                    "pending": True,
-                    "sequence": switch_sequence,
-                    "reason": reason,
-                    "logged": False,
-                }
-                st.session_state[auto_switch_state_key] = auto_switch_state
-                pending_switch = True
-                _append_log(
-                    f"⚠ Requesting MetaMask network switch to ARC chain {expected_chain_id} (0x{expected_chain_id:x})."
-                    if expected_chain_id is not None
-                    else "⚠ Requesting MetaMask network switch to configured chain."
+                if not pending_connect:
+                    if st.button("Connect MetaMask", key=connect_button_key):
+                        connect_sequence = _next_sequence()
+                        reason = (
+                            f"role '{required_role}' requires MetaMask signer"
+                            if required_role
+                            else "tool requires MetaMask signer"
+                        )
+                        auto_connect_state = {
+                            "attempted": True,
+                            "pending": True,
+                            "sequence": connect_sequence,
+                            "reason": reason,
+                            "logged": False,
+                        }
+                        tool_ctx["auto_connect"] = auto_connect_state
+                        pending_connect = True
+                        _append_log(
+                            "⚠ Requesting MetaMask connection. Approve the request in MetaMask."
+                        )
+                        METAMASK_LOGGER.info(
+                            "MetaMask popup (connect) for MCP tool '%s'. Reason: %s.",
+                            selected,
+                            reason,
+                        )
+                        auto_connect_state["logged"] = True
+                        tool_ctx["auto_connect"] = auto_connect_state
+                        st_rerun()
+                else:
+                    st.info("Waiting for MetaMask connection…")
+            else:
+                tool_ctx["auto_connect"] = {}
+                pending_connect = False
+                connect_sequence = None
+
+            if pending_connect and pending_command == "connect":
+                connect_payload = command_result
+                if isinstance(connect_payload, dict):
+                    _append_log(f"(info) MetaMask payload: {connect_payload}")
+                    auto_connect_state["pending"] = False
+                    tool_ctx["auto_connect"] = auto_connect_state
+                    payload_error = connect_payload.get("error")
+                    payload_status = str(connect_payload.get("status") or "").lower()
+                    payload_address = connect_payload.get("address")
+                    payload_chain = connect_payload.get("chainId")
+                    if payload_address:
+                        connected_address = str(payload_address)
+                        wallet_connected = True
+                        mm_state["wallet_address"] = connected_address
+                        default_wallet["address"] = connected_address
+                    if payload_chain is not None:
+                        current_chain_id = payload_chain
+                        mm_state["wallet_chain"] = payload_chain
+                        default_wallet["chainId"] = payload_chain
+                    if payload_error:
+                        _append_log(f"✖ MetaMask connection error: {payload_error}")
+                    elif payload_status == "connected":
+                        _append_log("✔ MetaMask connected. Checking network…")
+                        tool_ctx["auto_connect"] = {}
+                    elif payload_status:
+                        _append_log(f"(info) MetaMask status: {payload_status}")
+
+            if current_chain_id is None:
+                current_chain_id = mm_state.get("wallet_chain")
+            if current_chain_id is None and isinstance(status_payload, dict):
+                current_chain_id = status_payload.get("chainId")
+            chain_mismatch = (
+                requires_metamask_wallet
+                and expected_chain_id is not None
+                and current_chain_id is not None
+                and current_chain_id != expected_chain_id
+            )
+
+            switch_button_key = f"{key_prefix}_switch_network_{selected}"
+            if pending_switch and not auto_switch_state.get("logged"):
+                stored_reason = (
+                    auto_switch_state.get("reason")
+                    or "MetaMask network switch pending (restored state)."
                 )
                 METAMASK_LOGGER.info(
                     "MetaMask popup (switch_network) for MCP tool '%s'. Reason: %s.",
                     selected,
-                    reason,
+                    stored_reason,
                 )
                 auto_switch_state["logged"] = True
-                st.session_state[auto_switch_state_key] = auto_switch_state
-        else:
-            st.info("Waiting for MetaMask network switch…")
-
-        if pending_switch and switch_sequence is not None:
-            switch_payload = wallet_command(
-                key=f"wallet_auto_switch_{key_prefix}_{selected}",
-                command="switch_network",
-                command_sequence=switch_sequence,
-                require_chain_id=expected_chain_id,
-                command_payload=(
-                    {"require_chain_id": expected_chain_id}
-                    if expected_chain_id is not None
-                    else None
-                ),
-                preferred_address=str(preferred_address) if preferred_address else None,
-                autoconnect=True,
-            )
-            if isinstance(switch_payload, dict):
-                _append_log(f"(info) MetaMask payload: {switch_payload}")
-                if switch_payload.get("commandSequence") == switch_sequence:
-                    auto_switch_state["pending"] = False
-                    st.session_state[auto_switch_state_key] = auto_switch_state
-                result_chain = _normalise_chain_id(switch_payload.get("chainId"))
-                if result_chain is not None:
-                    current_chain_id = result_chain
-                    mm_state["wallet_chain"] = result_chain
-                    st.session_state[mm_state_key] = mm_state
-                    st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-                    if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                        st.session_state[DEFAULT_SESSION_KEY]["chainId"] = result_chain
-                status_msg = switch_payload.get("status")
-                error_msg = switch_payload.get("error")
-                if result_chain == expected_chain_id:
-                    _append_log(
-                        f"✔ Wallet switched to ARC chain {expected_chain_id} (0x{expected_chain_id:x})."
-                    )
-                    chain_mismatch = False
-                    st.session_state.pop(auto_switch_state_key, None)
-                elif result_chain is not None and expected_chain_id is not None:
-                    _append_log(
-                        f"! MetaMask reported switch to chain {result_chain} (0x{result_chain:x}); still expecting ARC {expected_chain_id} (0x{expected_chain_id:x})."
-                    )
-                if status_msg:
-                    st.info(f"MetaMask status: {status_msg}")
-                    _append_log(f"(info) MetaMask status: {status_msg}")
-                if error_msg:
-                    st.warning(f"MetaMask reported: {error_msg}")
-                    _append_log(f"✖ MetaMask network switch error: {error_msg}")
-            elif switch_payload is not None:
-                _append_log(f"! Unexpected MetaMask response: {switch_payload}")
-    else:
-        if auto_switch_state_key in st.session_state:
-            st.session_state.pop(auto_switch_state_key, None)
-
-    if (
-        requires_metamask_wallet
-        and expected_chain_id is not None
-        and wallet_connected
-        and current_chain_id == expected_chain_id
-    ):
-        _append_log(
-            f"✔ Wallet ready on ARC chain {expected_chain_id} (0x{expected_chain_id:x})."
-        )
-
-    if (
-        requires_metamask_wallet
-        and expected_chain_id is not None
-        and not wallet_connected
-    ):
-        st.warning(
-            "Connect your MetaMask wallet to continue. If a provider selection window appears, choose MetaMask."
-        )
-
-    if isinstance(existing_state, dict) and existing_state.get("metamask"):
-        st.markdown("### MetaMask bridge")
-        render_wallet_section(existing_state, w3, key_prefix, selected)
-        st.info(
-            "Complete the wallet action above or clear the MetaMask state before running the tool again."
-        )
-        if st.button("Clear MetaMask state", key=f"{mm_state_key}_clear"):
-            st.session_state.pop(mm_state_key, None)
-            st_rerun()
-        return
+                tool_ctx["auto_switch"] = auto_switch_state
 
-    schema = next(item for item in tools_schema if item["function"]["name"] == selected)
-    parameters = schema["function"].get("parameters", {})
-    props = parameters.get("properties", {})
-    required = set(parameters.get("required", []))
-
-    inputs: Dict[str, Any] = {}
-    for name, details in props.items():
-        field_type = details.get("type", "string")
-        label = f"{name} ({field_type})"
-        default = details.get("default")
-        if parameter_defaults:
-            default = parameter_defaults.get(selected, {}).get(name, default)
+            if wallet_connected and chain_mismatch:
+                actual_hex = (
+                    f"0x{current_chain_id:x}" if current_chain_id is not None else "unknown"
+                )
+                st.error(
+                    f"Wallet is connected to chain {current_chain_id} ({actual_hex}); switch to ARC chain {expected_chain_id} ({expected_hex}) before running MCP tools."
+                )
+                st.caption(
+                    "MetaMask should prompt for a network change. Approve the switch to continue."
+                )
+                if not pending_switch:
+                    if st.button("Switch MetaMask to ARC", key=switch_button_key):
+                        switch_sequence = _next_sequence()
+                        reason = (
+                            f"wallet on chain {current_chain_id}; expected {expected_chain_id}"
+                            if expected_chain_id is not None and current_chain_id is not None
+                            else "wallet network mismatch"
+                        )
+                        auto_switch_state = {
+                            "attempted": True,
+                            "pending": True,
+                            "sequence": switch_sequence,
+                            "reason": reason,
+                            "logged": False,
+                        }
+                        tool_ctx["auto_switch"] = auto_switch_state
+                        pending_switch = True
+                        _append_log(
+                            f"⚠ Requesting MetaMask network switch to ARC chain {expected_chain_id} ({expected_hex})."
+                            if expected_chain_id is not None
+                            else "⚠ Requesting MetaMask network switch to configured chain."
+                        )
+                        METAMASK_LOGGER.info(
+                            "MetaMask popup (switch_network) for MCP tool '%s'. Reason: %s.",
+                            selected,
+                            reason,
+                        )
+                        auto_switch_state["logged"] = True
+                        tool_ctx["auto_switch"] = auto_switch_state
+                        st_rerun()
+                else:
+                    st.info("Waiting for MetaMask network switch…")
+
+                if pending_switch and pending_command == "switch_network":
+                    switch_payload = command_result
+                    if isinstance(switch_payload, dict):
+                        _append_log(f"(info) MetaMask payload: {switch_payload}")
+                        auto_switch_state["pending"] = False
+                        tool_ctx["auto_switch"] = auto_switch_state
+                        result_chain = switch_payload.get("chainId")
+                        if result_chain is not None:
+                            current_chain_id = result_chain
+                            mm_state["wallet_chain"] = result_chain
+                            default_wallet["chainId"] = result_chain
+                        status_msg = switch_payload.get("status")
+                        error_msg = switch_payload.get("error")
+                        if result_chain == expected_chain_id:
+                            _append_log(
+                                f"✔ Wallet switched to ARC chain {expected_chain_id} ({expected_hex})."
+                            )
+                            chain_mismatch = False
+                            tool_ctx["auto_switch"] = {}
+                        elif result_chain is not None and expected_chain_id is not None:
+                            _append_log(
+                                f"! MetaMask reported switch to chain {result_chain} (0x{result_chain:x}); still expecting ARC {expected_chain_id} ({expected_hex})."
+                            )
+                        if status_msg:
+                            st.info(f"MetaMask status: {status_msg}")
+                            _append_log(f"(info) MetaMask status: {status_msg}")
+                        if error_msg:
+                            st.warning(f"MetaMask reported: {error_msg}")
+                            _append_log(f"✖ MetaMask network switch error: {error_msg}")
+            else:
+                tool_ctx["auto_switch"] = {}
+
+            if (
+                requires_metamask_wallet
+                and expected_chain_id is not None
+                and wallet_connected
+                and current_chain_id == expected_chain_id
+            ):
+                _append_log(
+                    f"✔ Wallet ready on ARC chain {expected_chain_id} ({expected_hex})."
+                )
 
-        widget_key = f"{key_prefix}_param_{selected}_{name}"
-        if field_type == "integer":
-            value = st.number_input(
-                label, value=int(default or 0), step=1, key=widget_key
-            )
-            inputs[name] = int(value)
-        elif field_type == "number":
-            value = st.number_input(label, value=float(default or 0), key=widget_key)
-            inputs[name] = float(value)
-        elif field_type == "boolean":
-            inputs[name] = st.checkbox(
-                label,
-                value=bool(default) if default is not None else False,
-                key=widget_key,
-            )
-        elif field_type == "array":
-            raw = st.text_area(
-                f"{label} (comma separated)",
-                value=", ".join(default or []) if isinstance(default, list) else "",
-                key=widget_key,
-            )
-            inputs[name] = [item.strip() for item in raw.split(",") if item.strip()]
+            if (
+                requires_metamask_wallet
+                and expected_chain_id is not None
+                and not wallet_connected
+            ):
+                st.warning(
+                    "Connect your MetaMask wallet to continue. If a provider selection window appears, choose MetaMask."
+                )
         else:
-            inputs[name] = st.text_input(
-                label,
-                value=str(default) if default is not None else "",
-                key=widget_key,
-            )
+            wallet_connected = True
+            chain_mismatch = False
 
-    disable_run = chain_mismatch or (requires_metamask_wallet and not wallet_connected)
-    if st.button("Run MCP tool", key=f"{key_prefix}_run_tool", disabled=disable_run):
-        if requires_metamask_wallet and not wallet_connected:
-            st.error(
-                "Connect your MetaMask wallet on the ARC network before running this tool."
-            )
-            return
-        if chain_mismatch:
-            st.error(
-                "Switch your wallet back to the ARC network before running this tool."
+        if isinstance(existing_state, dict) and existing_state.get("metamask"):
+            st.markdown("### MetaMask bridge")
+            render_wallet_section(existing_state, w3, key_prefix, selected)
+            st.info(
+                "Complete the wallet action above or clear the MetaMask state before running the tool again."
             )
-            return
-        missing = [param for param in required if not inputs.get(param)]
-        if missing:
-            st.error(f"Missing required parameters: {', '.join(missing)}")
-            return
-
-        handler = function_map.get(selected)
-        if handler is None:
-            st.error("Selected tool does not have an implementation.")
+            if st.button(
+                "Clear MetaMask state", key=f"mm_state_{key_prefix}_{selected}_clear"
+            ):
+                tool_ctx["mm"] = {}
+                st_rerun()
             return
 
-        with st.spinner(f"Running `{selected}`..."):
-            try:
-                result = handler(**inputs)
-            except TypeError as exc:
-                st.error(f"Parameter mismatch: {exc}")
+        schema = schema_by_name[selected]
+        required = schema["function"].get("parameters", {}).get("required", [])
+        render_inputs = _compile_input_renderer(key_prefix, selected, schema)
+        disable_run = chain_mismatch or (requires_metamask_wallet and not wallet_connected)
+        # Parameter edits stay client-side until submit, so typing does not rerun
+        # the MetaMask coordination above.
+        with st.form(f"{key_prefix}_tool_form_{selected}", clear_on_submit=False):
+            inputs = render_inputs(selected, key_prefix, parameter_defaults)
+            if required:
+                st.caption(f"Required parameters: {', '.join(required)}")
+            submitted = st.form_submit_button("Run MCP tool", disabled=disable_run)
+        if submitted:
+            if requires_metamask_wallet and not wallet_connected:
+                st.error(
+                    "Connect your MetaMask wallet on the ARC network before running this tool."
+                )
                 return
-            except Exception as exc:
-                st.error(f"Tool execution failed: {exc}")
+            if chain_mismatch:
+                st.error(
+                    "Switch your wallet back to the ARC network before running this tool."
+                )
+                return
+            missing = [param for param in required if not inputs.get(param)]
+            if missing:
+                st.error(f"Missing required parameters: {', '.join(missing)}")
+                return
+            handler = function_map.get(selected)
+            if handler is None:
+                st.error("Selected tool does not have an implementation.")
                 return
 
-        st.success("Tool completed")
-        try:
-            parsed = json.loads(result) if isinstance(result, str) else result
-        except Exception:
-            parsed = result if isinstance(result, str) else json.dumps(result)
-
-        if (
-            isinstance(parsed, dict)
-            and parsed.get("success")
-            and isinstance(parsed.get("metamask"), dict)
-        ):
-            mm = parsed["metamask"]
-            state_key = f"mm_state_{key_prefix}_{selected}"
-            mm_state = (
-                st.session_state.get(state_key, {})
-                if isinstance(st.session_state.get(state_key), dict)
-                else {}
-            )
-            mm_state["metamask"] = mm
-            st.session_state[state_key] = mm_state
-            st.markdown("### MetaMask bridge")
-            render_wallet_section(mm_state, w3, key_prefix, selected)
-            st.stop()
-
-        try:
-            if isinstance(parsed, (list, dict)):
-                st.json(parsed)
-            else:
-                st.write(parsed)
-        except Exception:
-            st.write(result if isinstance(result, str) else json.dumps(result))
+            with st.spinner(f"Running `{selected}`..."):
+                try:
+                    result = handler(**inputs)
+                except TypeError as exc:
+                    st.error(f"Parameter mismatch: {exc}")
+                    return
+                except Exception as exc:
+                    st.error(f"Tool execution failed: {exc}")
+                    return
+
+            st.success("Tool completed")
+            parsed: Any = result
+            if isinstance(result, str):
+                try:
+                    parsed = _loads(result)
+                except Exception:
+                    pass
+
+            if (
+                isinstance(parsed, dict)
+                and parsed.get("success")
+                and isinstance(parsed.get("metamask"), dict)
+            ):
+                mm = parsed["metamask"]
+                mm_state = tool_ctx["mm"]
+                mm_state["metamask"] = mm
+                st.markdown("### MetaMask bridge")
+                render_wallet_section(mm_state, w3, key_prefix, selected)
+                st.stop()
+
+            oversized = (
+                isinstance(result, str) and len(result) > LARGE_RESULT_CHARS
+            ) or (isinstance(parsed, list) and len(parsed) > LARGE_RESULT_ITEMS)
+            try:
+                if isinstance(parsed, list) and len(parsed) > RESULT_PAGE_SIZE:
+                    _render_result_pages(
+                        parsed, f"{key_prefix}_result_page_{selected}"
+                    )
+                elif isinstance(parsed, (list, dict)):
+                    st.json(parsed, expanded=not oversized)
+                else:
+                    st.write(parsed)
+            except Exception:
+                st.write(result if isinstance(result, str) else _dumps(result))
+            if oversized:
+                st.download_button(
+                    "Download full result",
+                    data=result if isinstance(result, str) else _dumps(result),
+                    file_name=f"{selected}_result.json",
+                    mime="application/json",
+                    key=f"{key_prefix}_download_result_{selected}",
+                )
+    finally:
+        if log_buffer.flush():
+            _render_logs()
@@ -1,20 +1,41 @@
 from __future__ import annotations
 
 import json
-from time import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from time import sleep, time
 from typing import Any, Dict, Optional
 
 import streamlit as st
 from web3 import Web3
+from web3.exceptions import TransactionNotFound
 
 from ..session import DEFAULT_SESSION_KEY
+from ..toolkit import format_receipt
 from ..wallet_connect_component import wallet_command
 from .logging_utils import get_metamask_logger
-from .rerun import st_rerun
+from .rerun import in_fragment_run, st_fragment, st_rerun
 
 
 METAMASK_LOGGER = get_metamask_logger()
 
+RECEIPT_POLL_INTERVAL = 0.2
+RECEIPT_POLL_TIMEOUT = 120.0
+
+
+@lru_cache(maxsize=128)
+def _parse_chain_str(value: str) -> Optional[int]:
+    stripped = value.strip()
+    if not stripped:
+        return None
+    try:
+        return int(stripped, 0)
+    except ValueError:
+        try:
+            return int(stripped)
+        except ValueError:
+            return None
+
 
 def _normalise_chain_id(value: Any) -> Optional[int]:
     if value is None:
@@ -22,22 +43,104 @@ def _normalise_chain_id(value: Any) -> Optional[int]:
     if isinstance(value, int):
         return value
     if isinstance(value, str):
-        stripped = value.strip()
-        if not stripped:
-            return None
-        try:
-            return int(stripped, 0)
-        except ValueError:
-            try:
-                return int(stripped)
-            except ValueError:
-                return None
+        return _parse_chain_str(value)
     return None
 
 
+def _normalise_payload_chain(payload: Any) -> Any:
+    """Return ``payload`` with its ``chainId`` already parsed to an int."""
+    if not isinstance(payload, dict) or "chainId" not in payload:
+        return payload
+    return {**payload, "chainId": _normalise_chain_id(payload["chainId"])}
+
+
+def _store_chain_id(state: Dict[str, Any], value: Any) -> Optional[int]:
+    """Normalise ``value`` once and record it as ``state["wallet_chain"]``."""
+    chain_id = _normalise_chain_id(value)
+    if chain_id is not None:
+        state["wallet_chain"] = chain_id
+    return chain_id
+
+
+def _get_default_wallet_dict() -> Dict[str, Any]:
+    """Shared wallet session entry, (re)initialised so callers can mutate it."""
+    wallet = st.session_state.get(DEFAULT_SESSION_KEY)
+    if not isinstance(wallet, dict):
+        wallet = {}
+        st.session_state[DEFAULT_SESSION_KEY] = wallet
+    return wallet
+
+
+def _next_sequence() -> int:
+    """Strictly increasing MetaMask command id, persisted per session.
+
+    Seeded from the clock once so a fresh session never reuses an id the
+    component may already have executed.
+    """
+    seq = st.session_state.get("_wallet_seq")
+    seq = int(time() * 1000) if not isinstance(seq, int) else seq + 1
+    st.session_state["_wallet_seq"] = seq
+    return seq
+
+
+def _tool_context(key_prefix: str, selected: str) -> Dict[str, Any]:
+    """All per-tool MetaMask state, kept under a single session_state entry."""
+    ctx_key = f"tool_ctx_{key_prefix}_{selected}"
+    ctx = st.session_state.get(ctx_key)
+    if not isinstance(ctx, dict):
+        ctx = {
+            "mm": {},
+            "logs": deque(maxlen=40),
+            "recent_logs": OrderedDict(),
+            "auto_switch": {},
+            "auto_connect": {},
+        }
+        st.session_state[ctx_key] = ctx
+    return ctx
+
+
+def _poll_receipt(
+    w3: Web3, mm_state: Dict[str, Any], tx_hash: str
+) -> Optional[Dict[str, Any]]:
+    """Single non-blocking receipt lookup; the summary is kept once mined."""
+    cached = mm_state.get("receipt")
+    if isinstance(cached, dict) and cached.get("txHash") == tx_hash:
+        return cached["summary"]
+    if mm_state.get("pending_tx_hash") != tx_hash:
+        mm_state["pending_tx_hash"] = tx_hash
+        mm_state["pending_tx_since"] = time()
+        try:
+            mm_state["pending_tx_block"] = w3.eth.block_number
+        except Exception:
+            mm_state["pending_tx_block"] = None
+    try:
+        receipt = w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
+    summary = format_receipt(receipt)
+    summary["transactionHash"] = summary["transactionHash"] or tx_hash
+    mm_state["receipt"] = {"txHash": tx_hash, "summary": summary}
+    mm_state["pending_tx_hash"] = None
+    return summary
+
+
+def _blocks_since(w3: Web3, start_block: Optional[int]) -> Optional[int]:
+    if start_block is None:
+        return None
+    try:
+        return max(w3.eth.block_number - start_block, 0)
+    except Exception:
+        return None
+
+
+@st_fragment
 def render_wallet_section(
     mm_state: Dict[str, Any], w3: Web3, key_prefix: str, selected: str
 ) -> None:
+    tool_ctx = _tool_context(key_prefix, selected)
+    # Bind once; every later update mutates mm_state in place.
+    if tool_ctx.get("mm") is not mm_state:
+        tool_ctx["mm"] = mm_state
     mm_payload = mm_state.get("metamask", {})
     tx_req = mm_payload.get("tx_request")
     if isinstance(tx_req, str):
@@ -54,8 +157,8 @@ def render_wallet_section(
             "Chain ID not provided by tool; ensure your wallet is connected to the correct network."
         )
 
-    cached = st.session_state.get(DEFAULT_SESSION_KEY, {})
-    preferred_address = cached.get("address") if isinstance(cached, dict) else None
+    default_wallet = _get_default_wallet_dict()
+    preferred_address = default_wallet.get("address")
     if from_address:
         preferred_address = from_address
         mm_state.setdefault("wallet_address", from_address)
@@ -82,34 +185,31 @@ def render_wallet_section(
         )
         pending["logged"] = True
         mm_state["pending_command"] = pending
-        st.session_state[f"mm_state_{key_prefix}_{selected}"] = mm_state
     component_key = f"wallet_headless_{key_prefix}_{selected}"
     command = pending.get("command") if isinstance(pending, dict) else None
-    command_payload = pending.get("payload") if isinstance(pending, dict) else None
     command_sequence = pending.get("sequence") if isinstance(pending, dict) else None
-
-    command_payload = {"tx_request": tx_req, "action": action}
+    command_payload: Dict[str, Any] = {"tx_request": tx_req, "action": action}
     if from_address:
         command_payload["from"] = from_address
 
-    component_value = wallet_command(
-        key=component_key,
-        command=command,
-        command_payload=command_payload,
-        command_sequence=command_sequence,
-        require_chain_id=chain_id,
-        tx_request=tx_req,
-        action=action,
-        preferred_address=preferred_address,
-        autoconnect=True,
+    component_value = _normalise_payload_chain(
+        wallet_command(
+            key=component_key,
+            command=command,
+            command_payload=command_payload,
+            command_sequence=command_sequence,
+            require_chain_id=chain_id,
+            tx_request=tx_req,
+            action=action,
+            preferred_address=preferred_address,
+            autoconnect=True,
+        )
     )
 
     if component_value is not None:
         mm_state["last_value"] = component_value
         if isinstance(component_value, dict):
-            component_chain = _normalise_chain_id(component_value.get("chainId"))
-            if component_chain is not None:
-                mm_state["wallet_chain"] = component_chain
+            _store_chain_id(mm_state, component_value.get("chainId"))
         if (
             isinstance(pending, dict)
             and isinstance(component_value, dict)
@@ -120,18 +220,11 @@ def render_wallet_section(
             addr = component_value.get("address")
             if addr:
                 mm_state["wallet_address"] = addr
-            chain = component_value.get("chainId")
-            if chain:
-                mm_state["wallet_chain"] = chain
 
     required_chain_id = _normalise_chain_id(chain_id)
-    wallet_chain_id = _normalise_chain_id(mm_state.get("wallet_chain"))
+    wallet_chain_id: Optional[int] = mm_state.get("wallet_chain")
     if wallet_chain_id is None:
-        cached_wallet = st.session_state.get(DEFAULT_SESSION_KEY, {})
-        if isinstance(cached_wallet, dict):
-            wallet_chain_id = _normalise_chain_id(cached_wallet.get("chainId"))
-            if wallet_chain_id is not None:
-                mm_state["wallet_chain"] = wallet_chain_id
+        wallet_chain_id = _store_chain_id(mm_state, default_wallet.get("chainId"))
 
     chain_mismatch = (
         required_chain_id is not None
@@ -146,7 +239,7 @@ def render_wallet_section(
             and pending is None
             and not auto_switch_attempted
         ):
-            sequence = int(time() * 1000)
+            sequence = _next_sequence()
             mm_state["pending_command"] = {
                 "command": "switch_network",
                 "payload": {"require_chain_id": required_chain_id},
@@ -162,8 +255,7 @@ def render_wallet_section(
                 wallet_chain_id,
                 required_chain_id,
             )
-            st.session_state[f"mm_state_{key_prefix}_{selected}"] = mm_state
-            st_rerun()
+            st_rerun(scope="fragment")
         required_hex = f"0x{required_chain_id:x}"
         actual_hex = f"0x{wallet_chain_id:x}"
         st.error(
@@ -193,7 +285,7 @@ def render_wallet_section(
         mm_state["pending_command"] = {
             "command": "connect",
             "payload": {},
-            "sequence": int(time() * 1000),
+            "sequence": _next_sequence(),
             "reason": "user clicked Connect wallet button",
             "logged": False,
         }
@@ -202,14 +294,13 @@ def render_wallet_section(
             key_prefix,
             selected,
         )
-        st.session_state[f"mm_state_{key_prefix}_{selected}"] = mm_state
-        st_rerun()
+        st_rerun(scope="fragment")
 
     if btn_cols[1].button("Switch network", key=f"btn_switch_{key_prefix}_{selected}"):
         mm_state["pending_command"] = {
             "command": "switch_network",
             "payload": {"require_chain_id": chain_id},
-            "sequence": int(time() * 1000),
+            "sequence": _next_sequence(),
             "reason": f"user requested switch to chain {chain_id}",
             "logged": False,
         }
@@ -218,8 +309,7 @@ def render_wallet_section(
             key_prefix,
             selected,
         )
-        st.session_state[f"mm_state_{key_prefix}_{selected}"] = mm_state
-        st_rerun()
+        st_rerun(scope="fragment")
 
     send_disabled = tx_req is None or chain_mismatch
     if btn_cols[2].button(
@@ -230,7 +320,7 @@ def render_wallet_section(
         mm_state["pending_command"] = {
             "command": "send_transaction",
             "payload": {"tx_request": tx_req, "action": action},
-            "sequence": int(time() * 1000),
+            "sequence": _next_sequence(),
             "reason": "user clicked Send transaction button",
             "logged": False,
         }
@@ -239,8 +329,7 @@ def render_wallet_section(
             key_prefix,
             selected,
         )
-        st.session_state[f"mm_state_{key_prefix}_{selected}"] = mm_state
-        st_rerun()
+        st_rerun(scope="fragment")
 
     last_result = mm_state.get("last_result")
     if isinstance(last_result, dict):
@@ -250,13 +339,9 @@ def render_wallet_section(
         addr_for_session = last_result.get("address") or mm_state.get("wallet_address")
         chain_for_session = last_result.get("chainId") or mm_state.get("wallet_chain")
         if addr_for_session:
-            st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-            if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                st.session_state[DEFAULT_SESSION_KEY]["address"] = addr_for_session
+            default_wallet["address"] = addr_for_session
         if chain_for_session:
-            st.session_state.setdefault(DEFAULT_SESSION_KEY, {})
-            if isinstance(st.session_state[DEFAULT_SESSION_KEY], dict):
-                st.session_state[DEFAULT_SESSION_KEY]["chainId"] = chain_for_session
+            default_wallet["chainId"] = chain_for_session
         if error_msg:
             st.error(f"MetaMask command failed: {error_msg}")
         else:
@@ -269,37 +354,48 @@ def render_wallet_section(
                     f"[View on Arcscan]({explorer_url})",
                     help="Opens Arcscan for the transaction",
                 )
-                with st.spinner("Waiting for receipt…"):
-                    try:
-                        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+                try:
+                    receipt_summary = _poll_receipt(w3, mm_state, tx_hash)
+                except Exception as exc:
+                    st.warning(f"Unable to fetch receipt yet: {exc}")
+                else:
+                    if receipt_summary is not None:
                         st.caption("Transaction receipt")
-                        st.json(
-                            {
-                                "transactionHash": (
-                                    receipt.get("transactionHash").hex()
-                                    if receipt.get("transactionHash")
-                                    else tx_hash
-                                ),
-                                "status": receipt.get("status"),
-                                "blockNumber": receipt.get("blockNumber"),
-                                "gasUsed": receipt.get("gasUsed"),
-                                "cumulativeGasUsed": receipt.get("cumulativeGasUsed"),
-                            }
-                        )
-                    except Exception as exc:
-                        st.warning(f"Unable to fetch receipt yet: {exc}")
-
-    with st.expander("Transaction request", expanded=False):
+                        st.json(receipt_summary)
+                    else:
+                        waited = time() - mm_state.get("pending_tx_since", time())
+                        blocks = _blocks_since(w3, mm_state.get("pending_tx_block"))
+                        progress = f" ({blocks} block(s) since send)" if blocks else ""
+                        if waited < RECEIPT_POLL_TIMEOUT:
+                            st.info(f"Waiting for receipt…{progress}")
+                            # Only loop on fragment runs: during a full run the
+                            # fragment rerun degrades to rerunning the whole app.
+                            if in_fragment_run():
+                                sleep(RECEIPT_POLL_INTERVAL)
+                                st_rerun(scope="fragment")
+                        else:
+                            st.warning(
+                                f"Receipt not available after {int(waited)}s{progress}; "
+                                "interact with the page to check again."
+                            )
+
+    # Toggles rather than expanders: collapsed expanders still serialise their
+    # contents, and toggling only reruns this fragment.
+    debug_cols = st.columns(2)
+    if debug_cols[0].toggle(
+        "Show transaction request", key=f"show_tx_{key_prefix}_{selected}"
+    ):
         if tx_req is not None:
             st.json(tx_req)
         else:
             st.write("(none)")
-
-    with st.expander("Latest component payload", expanded=False):
+    if debug_cols[1].toggle(
+        "Show component payload", key=f"show_payload_{key_prefix}_{selected}"
+    ):
         st.write(component_value)
 
     if st.button("Clear MetaMask state", key=f"clear_mm_{key_prefix}_{selected}"):
-        st.session_state.pop(f"mm_state_{key_prefix}_{selected}", None)
+        tool_ctx["mm"] = {}
         st_rerun()
 
     if not chain_mismatch and mm_state.get("_auto_switch_attempted"):
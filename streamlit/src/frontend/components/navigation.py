@@ -12,21 +12,40 @@ PAGE_ENTRIES: tuple[tuple[str, str], ...] = (
 )
 
 
+def _on_navigation_change() -> None:
+    # Clicking the active segment deselects it; keep the current page highlighted.
+    selected = st.session_state.get("navigation_selector")
+    if selected is None:
+        st.session_state["navigation_selector"] = st.session_state["active_page"]
+    else:
+        st.session_state["active_page"] = selected
+
+
 def render_navigation() -> str:
     """Render the sidebar navigation and return the selected page."""
 
     with st.sidebar:
         if "active_page" not in st.session_state:
             st.session_state["active_page"] = PAGE_ENTRIES[0][0]
+        # Seeded through session state rather than ``default=`` because the
+        # change callback also writes it.
+        if st.session_state.get("navigation_selector") is None:
+            st.session_state["navigation_selector"] = st.session_state["active_page"]
 
         st.markdown("<div style='min-height:3rem'></div>", unsafe_allow_html=True)
 
-        active = st.session_state["active_page"]
-
-        for internal_name, label in PAGE_ENTRIES:
-            button_type = "primary" if active == internal_name else "secondary"
-            if st.button(label, width="stretch", type=button_type):
-                st.session_state["active_page"] = internal_name
-                active = internal_name
-
-    return active
+        labels = dict(PAGE_ENTRIES)
+
+        # One widget instead of a button per page; the highlight also tracks the
+        # selection on the same run rather than lagging a rerun behind.
+        st.segmented_control(
+            "Navigation",
+            options=list(labels),
+            format_func=labels.__getitem__,
+            key="navigation_selector",
+            on_change=_on_navigation_change,
+            label_visibility="collapsed",
+            width="stretch",
+        )
+
+    return st.session_state["active_page"]
@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import os
+from collections import deque
 from dataclasses import dataclass
-from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import streamlit as st
 from web3 import Web3
+from web3.contract import Contract
 from eth_account import Account
 
 from ..cctp_bridge import (
@@ -23,9 +26,7 @@ from ..cctp_bridge import (
     DEFAULT_MAX_FEE_BUFFER,
     ARC_TX_EXPLORER_TEMPLATE,
     ERC20_ABI,
-    TOKEN_MESSENGER_ABI,
     _parse_usdc_amount,
-    _address_to_bytes32,
     _normalise_tx_hash,
     _init_web3,
     _apply_gas_values,
@@ -33,12 +34,10 @@ from ..cctp_bridge import (
     _ensure_hex_bytes,
     _encode_receive_message_call_data,
 )
-from ..config import (
-    ARC_RPC_ENV,
-    GAS_LIMIT_ENV,
-    GAS_PRICE_GWEI_ENV,
-)
+from ..config import ARC_RPC_ENV
 from ..toolkit_lib.messages import tool_error, tool_success
+from ..toolkit_lib.tx_helpers import resolve_chain_id
+from ..web3_utils import checksum_address
 from ..mcp_lib.constants import (
     MCP_BORROWER_BRIDGE_SESSION_KEY,
     ATTESTATION_POLL_INTERVAL,
@@ -46,28 +45,105 @@ from ..mcp_lib.constants import (
     ATTESTATION_INITIAL_TIMEOUT,
 )
 
+# 4-byte selectors for the calls the borrower signs; fixed by their signatures.
+_APPROVE_SELECTOR_HEX = bytes(Web3.keccak(text="approve(address,uint256)")[:4]).hex()
+_DEPOSIT_FOR_BURN_SELECTOR_HEX = bytes(
+    Web3.keccak(
+        text="depositForBurn(uint256,uint32,bytes32,address,bytes32,uint256,uint32)"
+    )[:4]
+).hex()
+
+
+@lru_cache(maxsize=4)
+def _cached_web3(rpc_url: str) -> Web3:
+    """ARC client (POA middleware, keep-alive session) shared by every tool call.
+
+    Failed connections raise BridgeError and are not cached.
+    """
+    return _init_web3(rpc_url)
+
+
+_ARC_USDC_CHECKSUM = Web3.to_checksum_address(ARC_USDC_ADDRESS)
+
+_USDC_SCALE = 1_000_000  # USDC has 6 decimals
+
+
+def _format_usdc(base_units: int) -> str:
+    """Human USDC amount from base units, trailing zeros dropped (1500000 -> "1.5")."""
+    whole, frac = divmod(int(base_units), _USDC_SCALE)
+    frac_digits = f"{frac:06d}".rstrip("0")
+    return f"{whole}.{frac_digits}" if frac_digits else str(whole)
+
+
+@lru_cache(maxsize=4)
+def _usdc_contract(w3: Web3) -> Contract:
+    """ARC USDC ERC-20 contract, built once per (cached) client."""
+    return w3.eth.contract(address=_ARC_USDC_CHECKSUM, abi=ERC20_ABI)
+
+
+_ZERO_BYTES32 = bytes(32)  # destinationCaller: anyone may relay the mint
+
+
+# approve/depositForBurn take only static ABI types, so their argument blocks are
+# plain concatenations of 32-byte words; no need for eth_abi's generic encoder.
+def _uint_word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def _address_word(address: str) -> bytes:
+    return int(address, 16).to_bytes(32, "big")
+
 
-def _parse_int(value: Optional[str]) -> Optional[int]:
-    if not value:
-        return None
-    try:
-        return int(value, 0)
-    except ValueError:
-        return None
+def _encode_approve(spender: str, amount: int) -> bytes:
+    return _address_word(spender) + _uint_word(amount)
 
 
-def _parse_gas_price(gwei_value: Optional[str]) -> Optional[int]:
-    if not gwei_value:
-        return None
-    try:
-        decimal_value = Decimal(gwei_value)
-        return int(decimal_value * Decimal(1_000_000_000))
-    except (InvalidOperation, ValueError):
-        return None
+def _encode_deposit_for_burn(
+    amount: int,
+    destination_domain: int,
+    mint_recipient: bytes,
+    burn_token: str,
+    destination_caller: bytes,
+    max_fee: int,
+    min_finality_threshold: int,
+) -> bytes:
+    if len(mint_recipient) != 32 or len(destination_caller) != 32:
+        raise ValueError("bytes32 arguments must be exactly 32 bytes")
+    return b"".join(
+        (
+            _uint_word(amount),
+            _uint_word(destination_domain),
+            mint_recipient,
+            _address_word(burn_token),
+            destination_caller,
+            _uint_word(max_fee),
+            _uint_word(min_finality_threshold),
+        )
+    )
+
+
+def _burn_tx_data(amount_base_units: int, polygon_address: str) -> str:
+    """Calldata for TokenMessenger.depositForBurn to ``polygon_address`` on Polygon."""
+    max_fee_base_units = amount_base_units - DEFAULT_MAX_FEE_BUFFER
+    if max_fee_base_units <= 0:
+        max_fee_base_units = 1
+    burn_params = _encode_deposit_for_burn(
+        amount_base_units,
+        POLYGON_DOMAIN_ID,
+        _address_word(polygon_address),
+        ARC_USDC_ADDRESS,
+        _ZERO_BYTES32,
+        max_fee_base_units,
+        DEFAULT_MIN_FINALITY,
+    )
+    return "0x" + _DEPOSIT_FOR_BURN_SELECTOR_HEX + burn_params.hex()
 
 
-def _bridge_logs_payload(logs: List[str]) -> Dict[str, Any]:
-    return {"logs": logs[-40:], "logCount": len(logs)}
+_BRIDGE_LOG_TAIL = 40
+
+
+def _bridge_logs_payload(logs: Iterable[str], log_count: int) -> Dict[str, Any]:
+    return {"logs": list(logs), "logCount": log_count}
 
 
 def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
@@ -97,9 +173,6 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
         if not arc_rpc_url:
             return tool_error("ARC RPC URL not configured.")
 
-        gas_limit = _parse_int(os.getenv(GAS_LIMIT_ENV))
-        gas_price_wei = _parse_gas_price(os.getenv(GAS_PRICE_GWEI_ENV))
-
         try:
             amount_dec, amount_base_units = _parse_usdc_amount(amount)
         except BridgeError as exc:
@@ -107,61 +180,29 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
 
         if not Web3.is_address(polygon_address):
             return tool_error("Invalid Polygon address.")
-        polygon_checksum = Web3.to_checksum_address(polygon_address)
+        polygon_checksum = checksum_address(polygon_address)
 
         try:
-            w3 = _init_web3(arc_rpc_url)
-            chain_id = w3.eth.chain_id
+            w3 = _cached_web3(arc_rpc_url)
+            chain_id = resolve_chain_id(w3)
         except BridgeError as exc:
             return tool_error(str(exc))
 
-        usdc = w3.eth.contract(
-            address=Web3.to_checksum_address(ARC_USDC_ADDRESS), abi=ERC20_ABI
-        )
-        messenger = w3.eth.contract(
-            address=Web3.to_checksum_address(TOKEN_MESSENGER_ADDRESS),
-            abi=TOKEN_MESSENGER_ABI,
-        )
-
         # Build the approve transaction for USDC
         # Directly encode without any simulation
-        from eth_abi import encode
-
-        # Function selector for approve(address,uint256)
-        approve_selector = Web3.keccak(text="approve(address,uint256)")[:4]
-        approve_params = encode(
-            ["address", "uint256"], [TOKEN_MESSENGER_ADDRESS, amount_base_units]
-        )
-        approve_tx_data = "0x" + approve_selector.hex() + approve_params.hex()
+        approve_params = _encode_approve(TOKEN_MESSENGER_ADDRESS, amount_base_units)
+        approve_tx_data = "0x" + _APPROVE_SELECTOR_HEX + approve_params.hex()
 
         # Build the depositForBurn transaction
-        max_fee_base_units = amount_base_units - DEFAULT_MAX_FEE_BUFFER
-        if max_fee_base_units <= 0:
-            max_fee_base_units = 1
-
-        # Function selector for depositForBurn
-        burn_selector = Web3.keccak(
-            text="depositForBurn(uint256,uint32,bytes32,address,bytes32,uint256,uint32)"
-        )[:4]
-        burn_params = encode(
-            ["uint256", "uint32", "bytes32", "address", "bytes32", "uint256", "uint32"],
-            [
-                amount_base_units,
-                POLYGON_DOMAIN_ID,
-                _address_to_bytes32(polygon_checksum),
-                Web3.to_checksum_address(ARC_USDC_ADDRESS),
-                bytes(32),
-                max_fee_base_units,
-                DEFAULT_MIN_FINALITY,
-            ],
-        )
-        burn_tx_data = "0x" + burn_selector.hex() + burn_params.hex()
+        burn_tx_data = _burn_tx_data(amount_base_units, polygon_checksum)
 
-        # Store bridge details in session for later reference
+        # Store bridge details in session for later reference; executeBorrowerBurn
+        # reuses the encoded burn call instead of rebuilding it
         bridge_state = {
             "amount_usdc": format(amount_dec, "f"),
             "amount_base_units": amount_base_units,
             "polygon_address": polygon_checksum,
+            "burn_tx_data": burn_tx_data,
             "status": "pending_approval",
         }
         st.session_state[MCP_BORROWER_BRIDGE_SESSION_KEY] = bridge_state
@@ -231,29 +272,10 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
         if not polygon_address:
             return tool_error("No polygon address in bridge state.")
 
-        # Build the depositForBurn transaction data
-        from eth_abi import encode
-
-        max_fee_base_units = amount_base_units - DEFAULT_MAX_FEE_BUFFER
-        if max_fee_base_units <= 0:
-            max_fee_base_units = 1
-
-        burn_selector = Web3.keccak(
-            text="depositForBurn(uint256,uint32,bytes32,address,bytes32,uint256,uint32)"
-        )[:4]
-        burn_params = encode(
-            ["uint256", "uint32", "bytes32", "address", "bytes32", "uint256", "uint32"],
-            [
-                amount_base_units,
-                POLYGON_DOMAIN_ID,
-                _address_to_bytes32(Web3.to_checksum_address(polygon_address)),
-                Web3.to_checksum_address(ARC_USDC_ADDRESS),
-                bytes(32),
-                max_fee_base_units,
-                DEFAULT_MIN_FINALITY,
-            ],
+        # Sessions prepared before the encoded call was stored rebuild it
+        burn_tx_data = bridge_state.get("burn_tx_data") or _burn_tx_data(
+            amount_base_units, polygon_address
         )
-        burn_tx_data = "0x" + burn_selector.hex() + burn_params.hex()
 
         # Update bridge state
         bridge_state["status"] = "pending_burn"
@@ -299,26 +321,23 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
 
         if not Web3.is_address(address):
             return tool_error("Invalid borrower address.")
-        borrower_checksum = Web3.to_checksum_address(address)
+        borrower_checksum = checksum_address(address)
 
         try:
-            w3 = _init_web3(arc_rpc_url)
+            w3 = _cached_web3(arc_rpc_url)
         except BridgeError as exc:
             return tool_error(str(exc))
 
-        usdc = w3.eth.contract(
-            address=Web3.to_checksum_address(ARC_USDC_ADDRESS), abi=ERC20_ABI
-        )
+        usdc = _usdc_contract(w3)
 
         try:
             balance = usdc.functions.balanceOf(borrower_checksum).call()
-            balance_decimal = Decimal(balance) / Decimal(10**6)  # USDC has 6 decimals
 
             return tool_success(
                 {
                     "borrower": borrower_checksum,
                     "usdc_balance": balance,
-                    "usdc_balance_human": format(balance_decimal, "f"),
+                    "usdc_balance_human": _format_usdc(balance),
                 }
             )
         except Exception as exc:
@@ -337,32 +356,27 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
             return tool_error("ARC RPC URL not configured.")
 
         try:
-            w3 = _init_web3(arc_rpc_url)
+            w3 = _cached_web3(arc_rpc_url)
         except BridgeError as exc:
             return tool_error(str(exc))
 
-        usdc = w3.eth.contract(
-            address=Web3.to_checksum_address(ARC_USDC_ADDRESS), abi=ERC20_ABI
-        )
+        usdc = _usdc_contract(w3)
 
         spender = spender_address or TOKEN_MESSENGER_ADDRESS
 
         try:
-            owner_checksum = Web3.to_checksum_address(address)
-            spender_checksum = Web3.to_checksum_address(spender)
+            owner_checksum = checksum_address(address)
+            spender_checksum = checksum_address(spender)
             allowance = usdc.functions.allowance(
                 owner_checksum, spender_checksum
             ).call()
-            allowance_decimal = Decimal(allowance) / Decimal(
-                10**6
-            )  # USDC has 6 decimals
 
             return tool_success(
                 {
                     "owner": owner_checksum,
                     "spender": spender_checksum,
                     "allowance": allowance,
-                    "allowance_human": format(allowance_decimal, "f"),
+                    "allowance_human": _format_usdc(allowance),
                     "is_token_messenger": spender_checksum.lower()
                     == TOKEN_MESSENGER_ADDRESS.lower(),
                 }
@@ -489,7 +503,15 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
         if not arc_rpc_url:
             return tool_error("ARC RPC URL not configured.")
 
-        logs: List[str] = []
+        # Only the tail is reported, so long polls keep a bounded buffer
+        logs: deque[str] = deque(maxlen=_BRIDGE_LOG_TAIL)
+        log_count = 0
+
+        def log(msg: Any) -> None:
+            nonlocal log_count
+            log_count += 1
+            logs.append(str(msg))
+
         try:
             # Poll for attestation
             message, attestation = poll_attestation(
@@ -497,14 +519,14 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
                 burn_tx_hash,
                 interval=ATTESTATION_POLL_INTERVAL,
                 timeout=30,  # Quick check, don't wait too long
-                log=lambda msg: logs.append(str(msg)),
+                log=log,
             )
 
             message_hex = _ensure_hex_bytes(message, "message")
             attestation_hex = _ensure_hex_bytes(attestation, "attestation")
 
             # Generate the Polygon mint call data
-            w3 = _init_web3(arc_rpc_url)
+            w3 = _cached_web3(arc_rpc_url)
             call_data = _encode_receive_message_call_data(
                 w3, message_hex, attestation_hex
             )
@@ -521,7 +543,7 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
                     "bridge": bridge_state,
                     "attestation_ready": True,
                     "message": "Attestation received! Ready to mint on Polygon.",
-                    **_bridge_logs_payload(logs),
+                    **_bridge_logs_payload(logs, log_count),
                 }
             )
 
@@ -535,7 +557,7 @@ def build_borrower_bridge_toolkit() -> Tuple[List[Dict[str, Any]], Dict[str, Any
                     "bridge": bridge_state,
                     "attestation_ready": False,
                     "message": f"Attestation not ready yet: {exc}. Keep polling...",
-                    **_bridge_logs_payload(logs),
+                    **_bridge_logs_payload(logs, log_count),
                 }
             )
 
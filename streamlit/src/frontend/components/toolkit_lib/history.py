@@ -7,16 +7,32 @@ import streamlit as st
 from .messages import render_tool_message, _render_user_message
 
 
+def _render_assistant_run(contents: list[str]) -> None:
+    # One bubble and one markdown element for consecutive assistant replies.
+    with st.chat_message("assistant"):
+        st.markdown("\n\n---\n\n".join(contents))
+
+
 def render_llm_history(messages: Iterable[Dict[str, Any]]) -> None:
+    assistant_run: list[str] = []
     for message in messages:
         role = message.get("role")
         content = message.get("content")
         if role == "system":
             continue
+        if role == "assistant":
+            # Tool-call turns carry no text; they would only add an empty bubble.
+            if content:
+                assistant_run.append(content)
+            continue
+        if assistant_run:
+            _render_assistant_run(assistant_run)
+            assistant_run = []
         if role == "user":
             _render_user_message(content or "")
-        elif role == "assistant":
-            with st.chat_message("assistant"):
-                st.markdown(content or "")
         elif role == "tool":
-            render_tool_message(message.get("name", "tool"), content or "")
+            render_tool_message(
+                message.get("name", "tool"), content or "", message.get("tool_call_id")
+            )
+    if assistant_run:
+        _render_assistant_run(assistant_run)
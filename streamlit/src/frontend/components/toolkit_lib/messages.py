@@ -2,20 +2,56 @@ from __future__ import annotations
 
 import json
 import os
+import re
 from decimal import Decimal
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 import streamlit as st
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+# Longer lists in a tool payload render truncated until the user asks for all.
+TOOL_OUTPUT_PREVIEW_ITEMS = 50
+
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    # orjson rejects integers wider than 64 bits and non-string keys; json copes.
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_json_default).decode()
+        except TypeError:
+            pass
+    return json.dumps(payload, default=_json_default)
+
+
+# orjson silently turns integers beyond 64 bits (raw wei amounts) into floats,
+# so any 20+ digit run sends the payload through the stdlib parser instead.
+_WIDE_INT = re.compile(r"\d{20}")
+
+
+def _loads(content: str) -> Any:
+    if orjson is not None and not _WIDE_INT.search(content):
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Every rerun re-renders the whole chat history from the same content strings;
+# parse each tool payload once. Callers must treat the result as read-only.
+@lru_cache(maxsize=256)
+def _parse_history_content(content: str) -> Any:
+    return _loads(content)
+
 
 def tool_success(payload: Dict[str, Any]) -> str:
-    return json.dumps({"success": True, **payload}, default=_json_default)
+    return _dumps({"success": True, **payload})
 
 
 def tool_error(message: str, **extras: Any) -> str:
-    return json.dumps(
-        {"success": False, "error": message, **extras}, default=_json_default
-    )
+    return _dumps({"success": False, "error": message, **extras})
 
 
 def _json_default(value: Any) -> Any:
@@ -24,7 +60,9 @@ def _json_default(value: Any) -> Any:
     return value
 
 
-def render_tool_message(tool_name: str, content: str) -> None:
+def render_tool_message(
+    tool_name: str, content: str, tool_call_id: Optional[str] = None
+) -> None:
     with st.chat_message("assistant"):
         expander_title = f"Tool `{tool_name}` output"
         st.markdown(f"✅ Tool `{tool_name}` completed. Expand below to review details.")
@@ -34,7 +72,7 @@ def render_tool_message(tool_name: str, content: str) -> None:
         parsed_response: Any = None
 
         try:
-            parsed_response = json.loads(content)
+            parsed_response = _parse_history_content(content)
             if isinstance(parsed_response, dict) and parsed_response.get("show_button"):
                 show_button = True
                 button_label = parsed_response.get(
@@ -47,7 +85,11 @@ def render_tool_message(tool_name: str, content: str) -> None:
             st.warning("Action required: expand the panel to approve this step.")
 
         with st.expander(expander_title, expanded=False):
-            _render_tool_content(content)
+            _render_tool_content(
+                content,
+                parsed_response,
+                full_view_key=f"tool_output_full_{tool_name}_{tool_call_id or hash(content)}",
+            )
 
             if show_button:
                 button_key = f"tx_button_{tool_name}_{hash(content)}"
@@ -61,43 +103,72 @@ def render_tool_message(tool_name: str, content: str) -> None:
                     st.rerun()
 
 
-def _render_tool_content(content: str) -> None:
+def _preview_lists(parsed: Any) -> Tuple[Any, bool]:
+    """Cap long lists at the top level (or one level into a dict) for display."""
+
+    def cap(value: Any) -> Tuple[Any, bool]:
+        if isinstance(value, list) and len(value) > TOOL_OUTPUT_PREVIEW_ITEMS:
+            return {
+                "_truncated": len(value),
+                "items": value[:TOOL_OUTPUT_PREVIEW_ITEMS],
+            }, True
+        return value, False
+
+    if isinstance(parsed, dict):
+        preview: Dict[str, Any] = {}
+        truncated = False
+        for key, value in parsed.items():
+            preview[key], capped = cap(value)
+            truncated = truncated or capped
+        return preview, truncated
+    return cap(parsed)
+
+
+def _render_tool_content(
+    content: str, parsed: Any = None, full_view_key: Optional[str] = None
+) -> None:
     if not content:
         st.write("(no content returned)")
         return
-    try:
-        parsed = json.loads(content)
-    except json.JSONDecodeError:
-        st.markdown(content)
-        return
+    if parsed is None:
+        try:
+            parsed = _parse_history_content(content)
+        except json.JSONDecodeError:
+            st.markdown(content)
+            return
     if isinstance(parsed, (list, dict)):
-        st.json(parsed)
+        preview, truncated = _preview_lists(parsed)
+        if (
+            truncated
+            and full_view_key
+            and st.toggle("Show all entries", key=full_view_key)
+        ):
+            preview = parsed
+        st.json(preview, expanded=not truncated)
     else:
         st.write(parsed)
 
 
+# One "### <name>" attached document: heading line, then body up to the next one.
+_SECTION_RE = re.compile(
+    r"^###[ \t]*([^\n]*)\n?(.*?)(?=^###|\Z)", re.MULTILINE | re.DOTALL
+)
+
+
 def _render_user_message(content: str) -> None:
     with st.chat_message("user"):
-        if content and "[Attached documents]" in content:
-            pre, attach_block = content.split("[Attached documents]", 1)
+        pre, marker, attach_block = (content or "").partition("[Attached documents]")
+        if marker:
             st.markdown(pre.strip())
-            import re
-
             preview_chars = int(os.getenv("CHAT_PREVIEW_MAX_CHARS", "1000"))
-            sections = re.split(r"(?m)^###\s*", attach_block)
-            if len(sections) > 1:
+            sections = list(_SECTION_RE.finditer(attach_block))
+            if sections:
                 with st.expander("Attached documents (truncated preview)"):
-                    for seg in sections:
-                        seg = seg.strip()
-                        if not seg:
+                    for section in sections:
+                        name = section.group(1).strip()
+                        body = section.group(2).strip()
+                        if not name and not body:
                             continue
-                        name_end = seg.find("\n")
-                        if name_end == -1:
-                            name = seg
-                            body = ""
-                        else:
-                            name = seg[:name_end].strip()
-                            body = seg[name_end + 1 :].strip()
                         trunc = body[:preview_chars]
                         ellipsis = "…" if len(body) > preview_chars else ""
                         st.markdown(f"**{name}**\n\n{trunc}{ellipsis}")
@@ -9,9 +9,17 @@ from web3.contract import Contract
 from web3.exceptions import ContractLogicError, BadFunctionCallOutput
 
 from .messages import tool_success, tool_error
-from .tx_helpers import fee_params, next_nonce, sign_and_send, metamask_tx_request
+from .tx_helpers import (
+    fee_params,
+    next_nonce,
+    optional_contract_functions,
+    resolve_chain_id,
+    sign_and_send,
+    metamask_tx_request,
+)
 
 from ..config import PRIVATE_KEY_ENV
+from ..web3_utils import checksum_address
 
 
 _LOAN_STATE_LABELS: Dict[int, str] = {
@@ -37,6 +45,9 @@ def build_lending_pool_toolkit(
 ) -> Tuple[list[Dict[str, Any]], Dict[str, Callable[..., str]]]:
     tools: list[Dict[str, Any]] = []
     handlers: Dict[str, Callable[..., str]] = {}
+    pool_fns = optional_contract_functions(
+        pool_contract, "loanStatus", "lenderStatus", "canOpenLoan"
+    )
 
     derived_private_key = private_key or os.getenv(PRIVATE_KEY_ENV)
     role_private_keys = role_private_keys or {}
@@ -98,7 +109,7 @@ def build_lending_pool_toolkit(
             "metamask": {
                 "tx_request": tx_req,
                 "action": "eth_sendTransaction",
-                "chainId": w3.eth.chain_id,
+                "chainId": resolve_chain_id(w3),
                 "hint": hint,
             }
         }
@@ -109,18 +120,18 @@ def build_lending_pool_toolkit(
     def _fees() -> Dict[str, int]:
         return fee_params(w3, gas_price_gwei)
 
+    token_scale = Decimal(10) ** int(token_decimals)
+    native_scale = Decimal(10) ** int(native_decimals)
+
     def _to_token_units(amount: float | int, *, use_native: bool = False) -> int:
         try:
             amt = Decimal(str(amount))
-            scale = Decimal(10) ** int(
-                native_decimals if use_native else token_decimals
-            )
-            return int(amt * scale)
+            return int(amt * (native_scale if use_native else token_scale))
         except Exception:
             return int(amount)
 
     def _from_token_units(amount: int, *, use_native: bool = False) -> Decimal:
-        scale = Decimal(10) ** int(native_decimals if use_native else token_decimals)
+        scale = native_scale if use_native else token_scale
         return (Decimal(amount) / scale) if amount else Decimal(0)
 
     def _normalize_reason(reason: str) -> str:
@@ -128,7 +139,7 @@ def build_lending_pool_toolkit(
 
     def _loan_status(address: str) -> Optional[tuple[int, int, int, int, int, bool]]:
         try:
-            status_fn = getattr(pool_contract.functions, "loanStatus", None)
+            status_fn = pool_fns["loanStatus"]
             if status_fn is not None:
                 raw = status_fn(address).call()
                 if isinstance(raw, tuple) and len(raw) == 6:
@@ -160,7 +171,7 @@ def build_lending_pool_toolkit(
 
     def _lender_status(address: str) -> Optional[tuple[int, int, int, int]]:
         try:
-            status_fn = getattr(pool_contract.functions, "lenderStatus", None)
+            status_fn = pool_fns["lenderStatus"]
             if status_fn is not None:
                 return status_fn(address).call()
             total_dep = int(
@@ -201,7 +212,7 @@ def build_lending_pool_toolkit(
 
     def _can_open_loan(address: str, principal_units: int) -> tuple[bool, str]:
         try:
-            checker = getattr(pool_contract.functions, "canOpenLoan", None)
+            checker = pool_fns["canOpenLoan"]
             if checker is None:
                 return _manual_can_open_loan(address, principal_units)
             try:
@@ -236,7 +247,7 @@ def build_lending_pool_toolkit(
 
     def lenderBalance_tool(lender_address: str) -> str:
         try:
-            lender = Web3.to_checksum_address(lender_address)
+            lender = checksum_address(lender_address)
             amount = int(
                 getattr(pool_contract.functions, "lenderBalance")(lender).call()
             )
@@ -262,7 +273,7 @@ def build_lending_pool_toolkit(
 
     def lenderStatus_tool(lender_address: str) -> str:
         try:
-            lender = Web3.to_checksum_address(lender_address)
+            lender = checksum_address(lender_address)
         except ValueError:
             return tool_error("Invalid lender address supplied.")
         status = _lender_status(lender)
@@ -301,7 +312,7 @@ def build_lending_pool_toolkit(
 
     def getLoan_tool(borrower_address: str) -> str:
         try:
-            borrower = Web3.to_checksum_address(borrower_address)
+            borrower = checksum_address(borrower_address)
             status = _loan_status(borrower)
             if status is None:
                 return tool_error("Unable to read loan status for borrower.")
@@ -353,7 +364,7 @@ def build_lending_pool_toolkit(
                 "Borrower address is required. Provide `borrower_address` or `wallet_address`."
             )
         try:
-            borrower = Web3.to_checksum_address(address_input)
+            borrower = checksum_address(address_input)
             banned = bool(getattr(pool_contract.functions, "isBanned")(borrower).call())
             return tool_success({"borrower": borrower, "banned": banned})
         except ValueError:
@@ -402,7 +413,7 @@ def build_lending_pool_toolkit(
                         "from": signer,
                         "nonce": next_nonce(w3, signer),
                         "gas": default_gas_limit,
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         "value": amt,
                         **_fees(),
                     }
@@ -472,14 +483,14 @@ def build_lending_pool_toolkit(
         status_address: Optional[str] = None
         if lender_addr:
             try:
-                status_address = Web3.to_checksum_address(lender_addr)
+                status_address = checksum_address(lender_addr)
             except ValueError:
                 status_address = None
         if status_address is None:
             signer = _acct_for_key(lender_key)
             if signer:
                 try:
-                    status_address = Web3.to_checksum_address(signer)
+                    status_address = checksum_address(signer)
                 except ValueError:
                     status_address = None
 
@@ -501,7 +512,7 @@ def build_lending_pool_toolkit(
                         "from": signer,
                         "nonce": next_nonce(w3, signer),
                         "gas": default_gas_limit,
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         **_fees(),
                     }
                 )
@@ -553,7 +564,7 @@ def build_lending_pool_toolkit(
         borrower_address: str, principal: float | int, term_seconds: int
     ) -> str:
         try:
-            borrower = Web3.to_checksum_address(borrower_address)
+            borrower = checksum_address(borrower_address)
         except ValueError:
             return tool_error("Invalid borrower address supplied.")
         if borrower_guard:
@@ -637,7 +648,7 @@ def build_lending_pool_toolkit(
                         "gas": max(
                             default_gas_limit, 500000
                         ),  # openLoan needs ~500k gas
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         **fees,
                     }
                 )
@@ -716,7 +727,7 @@ def build_lending_pool_toolkit(
             )
 
         try:
-            borrower = Web3.to_checksum_address(borrower_addr)
+            borrower = checksum_address(borrower_addr)
         except ValueError:
             return tool_error("Borrower address is not valid.")
 
@@ -743,7 +754,7 @@ def build_lending_pool_toolkit(
                         "from": signer,
                         "nonce": next_nonce(w3, signer),
                         "gas": default_gas_limit,
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         "value": amt,
                         **_fees(),
                     }
@@ -793,7 +804,7 @@ def build_lending_pool_toolkit(
     def checkDefaultAndBan_tool(borrower_address: str) -> str:
         signer = _acct_for_key(owner_key)
         try:
-            borrower = Web3.to_checksum_address(borrower_address)
+            borrower = checksum_address(borrower_address)
         except ValueError:
             return tool_error("Invalid borrower address supplied.")
         if signer and owner_key:
@@ -807,7 +818,7 @@ def build_lending_pool_toolkit(
                         "from": signer,
                         "nonce": nonce,
                         "gas": default_gas_limit,
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         **fees,
                     }
                 )
@@ -861,7 +872,7 @@ def build_lending_pool_toolkit(
 
     def unban_tool(borrower_address: str) -> str:
         try:
-            borrower = Web3.to_checksum_address(borrower_address)
+            borrower = checksum_address(borrower_address)
         except ValueError:
             return tool_error("Invalid borrower address supplied.")
 
@@ -874,7 +885,7 @@ def build_lending_pool_toolkit(
                         "from": signer,
                         "nonce": next_nonce(w3, signer),
                         "gas": default_gas_limit,
-                        "chainId": w3.eth.chain_id,
+                        "chainId": resolve_chain_id(w3),
                         **_fees(),
                     }
                 )
@@ -1,47 +1,117 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Any, Callable, Dict, Optional, Tuple
 
 from web3 import Web3
 from web3.contract import Contract
 from web3.exceptions import ContractLogicError, Web3Exception
 
-from .messages import tool_success, tool_error
-from .tx_helpers import fee_params, next_nonce, sign_and_send
+from .messages import _loads, tool_success, tool_error
+from .tx_helpers import (
+    fee_params,
+    next_nonce,
+    optional_contract_functions,
+    prime_base_fee,
+    resolve_chain_id,
+    sign_and_send,
+)
 
 from ..config import PRIVATE_KEY_ENV
+from ..web3_utils import checksum_address, get_chain_id
 
 
 _ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
+_SCORE_OUTPUTS = [
+    {"name": "value", "type": "uint256"},
+    {"name": "timestamp", "type": "uint256"},
+    {"name": "valid", "type": "bool"},
+]
 
-def _has_sbt(w3: Web3, contract: Contract, checksum_wallet: str) -> bool:
+# Minimal ABIs for contracts whose published ABI lacks the named function.
+_FALLBACK_ABIS: Dict[str, list[Dict[str, Any]]] = {
+    "ownerOf": [
+        {
+            "name": "ownerOf",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [{"name": "tokenId", "type": "uint256"}],
+            "outputs": [{"name": "", "type": "address"}],
+        }
+    ],
+    "score": [
+        {
+            "name": "getScore",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [{"name": "borrower", "type": "address"}],
+            "outputs": _SCORE_OUTPUTS,
+        },
+        {
+            "name": "scores",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [{"name": "", "type": "address"}],
+            "outputs": _SCORE_OUTPUTS,
+        },
+    ],
+    "issueScore": [
+        {
+            "name": "issueScore",
+            "type": "function",
+            "stateMutability": "nonpayable",
+            "inputs": [
+                {"name": "borrower", "type": "address"},
+                {"name": "value", "type": "uint256"},
+            ],
+            "outputs": [],
+        }
+    ],
+    "revokeScore": [
+        {
+            "name": "revokeScore",
+            "type": "function",
+            "stateMutability": "nonpayable",
+            "inputs": [{"name": "borrower", "type": "address"}],
+            "outputs": [],
+        }
+    ],
+}
+
+
+@lru_cache(maxsize=32)
+def _fallback_contract(w3: Web3, address: str, abi_key: str) -> Contract:
+    """Build a minimal-ABI contract once instead of re-parsing its ABI per call."""
+    return w3.eth.contract(address=address, abi=_FALLBACK_ABIS[abi_key])
+
+
+# owner() only moves on transferOwnership, so it is remembered per (chain, contract).
+# Set ARC_REFRESH_CONTRACT_OWNER=1 to read it from the chain before every write.
+_CONTRACT_OWNERS: Dict[Tuple[Optional[int], str], str] = {}
+
+
+def _has_sbt(
+    w3: Web3,
+    contract: Contract,
+    contract_fns: Dict[str, Any],
+    checksum_wallet: str,
+) -> bool:
     try:
-        has_fn = getattr(contract.functions, "hasSbt", None)
+        has_fn = contract_fns["hasSbt"]
         if has_fn is not None:
             return bool(has_fn(checksum_wallet).call())
     except Exception:
         pass
     try:
-        tid_fn = getattr(contract.functions, "tokenIdOf", None)
+        tid_fn = contract_fns["tokenIdOf"]
         token_id = (
             int(tid_fn(checksum_wallet).call()) if tid_fn else int(checksum_wallet, 16)
         )
-        owner_fn = getattr(contract.functions, "ownerOf", None)
+        owner_fn = contract_fns["ownerOf"]
         if owner_fn is None:
-            fb = w3.eth.contract(
-                address=contract.address,
-                abi=[
-                    {
-                        "name": "ownerOf",
-                        "type": "function",
-                        "stateMutability": "view",
-                        "inputs": [{"name": "tokenId", "type": "uint256"}],
-                        "outputs": [{"name": "", "type": "address"}],
-                    }
-                ],
-            )
+            fb = _fallback_contract(w3, contract.address, "ownerOf")
             owner = fb.functions.ownerOf(token_id).call()
         else:
             owner = owner_fn(token_id).call()
@@ -60,8 +130,27 @@ def build_llm_toolkit(
     gas_price_gwei: str,
 ) -> Tuple[list[Dict[str, Any]], Dict[str, Callable[..., str]]]:
     derived_private_key = private_key or os.getenv(PRIVATE_KEY_ENV)
+    # Derive the signer once; key decoding is EC work every write would repeat.
+    signer_address: Optional[str] = None
+    signer_error: Optional[str] = None
+    if derived_private_key:
+        try:
+            signer_address = w3.eth.account.from_key(derived_private_key).address
+        except Exception as exc:
+            signer_error = f"Unable to derive signer from private key: {exc}"
     tools: list[Dict[str, Any]] = []
     handlers: Dict[str, Callable[..., str]] = {}
+    contract_fns = optional_contract_functions(
+        contract,
+        "hasSbt",
+        "tokenIdOf",
+        "ownerOf",
+        "getScore",
+        "scores",
+        "owner",
+        "issueScore",
+        "revokeScore",
+    )
 
     def register(
         name: str,
@@ -84,12 +173,12 @@ def build_llm_toolkit(
     # ---- Reads ----
     def hasSbt_tool(wallet_address: str) -> str:
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Invalid wallet address supplied.")
         # Preferred
         try:
-            has_fn = getattr(contract.functions, "hasSbt", None)
+            has_fn = contract_fns["hasSbt"]
             if has_fn is not None:
                 has = bool(has_fn(checksum_wallet).call())
                 return tool_success(
@@ -99,26 +188,15 @@ def build_llm_toolkit(
             pass
         # Fallback via ownerOf(tokenId)
         try:
-            tid_fn = getattr(contract.functions, "tokenIdOf", None)
+            tid_fn = contract_fns["tokenIdOf"]
             tid = (
                 int(tid_fn(checksum_wallet).call())
                 if tid_fn
                 else int(checksum_wallet, 16)
             )
-            owner_of_fn = getattr(contract.functions, "ownerOf", None)
+            owner_of_fn = contract_fns["ownerOf"]
             if owner_of_fn is None:
-                fb = w3.eth.contract(
-                    address=contract.address,
-                    abi=[
-                        {
-                            "name": "ownerOf",
-                            "type": "function",
-                            "stateMutability": "view",
-                            "inputs": [{"name": "tokenId", "type": "uint256"}],
-                            "outputs": [{"name": "", "type": "address"}],
-                        }
-                    ],
-                )
+                fb = _fallback_contract(w3, contract.address, "ownerOf")
                 owner = fb.functions.ownerOf(tid).call()
             else:
                 owner = owner_of_fn(tid).call()
@@ -163,12 +241,12 @@ def build_llm_toolkit(
 
     def getScore_tool(wallet_address: str) -> str:
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Invalid wallet address supplied.")
         # Preferred getScore
         try:
-            score_fn = getattr(contract.functions, "getScore", None)
+            score_fn = contract_fns["getScore"]
             if score_fn is not None:
                 value, timestamp, valid = score_fn(checksum_wallet).call()
                 return tool_success(
@@ -184,7 +262,7 @@ def build_llm_toolkit(
             pass
         # Fallback scores mapping
         try:
-            scores_fn = getattr(contract.functions, "scores", None)
+            scores_fn = contract_fns["scores"]
             if scores_fn is not None:
                 value, timestamp, valid = scores_fn(checksum_wallet).call()
                 return tool_success(
@@ -200,33 +278,7 @@ def build_llm_toolkit(
             pass
         # Minimal ABI fallback
         try:
-            fb = w3.eth.contract(
-                address=contract.address,
-                abi=[
-                    {
-                        "name": "getScore",
-                        "type": "function",
-                        "stateMutability": "view",
-                        "inputs": [{"name": "borrower", "type": "address"}],
-                        "outputs": [
-                            {"name": "value", "type": "uint256"},
-                            {"name": "timestamp", "type": "uint256"},
-                            {"name": "valid", "type": "bool"},
-                        ],
-                    },
-                    {
-                        "name": "scores",
-                        "type": "function",
-                        "stateMutability": "view",
-                        "inputs": [{"name": "", "type": "address"}],
-                        "outputs": [
-                            {"name": "value", "type": "uint256"},
-                            {"name": "timestamp", "type": "uint256"},
-                            {"name": "valid", "type": "bool"},
-                        ],
-                    },
-                ],
-            )
+            fb = _fallback_contract(w3, contract.address, "score")
             try:
                 value, timestamp, valid = fb.functions.getScore(checksum_wallet).call()
                 strategy = "fallback_getScore"
@@ -265,14 +317,123 @@ def build_llm_toolkit(
         getScore_tool,
     )
 
+    def getScores_tool(wallet_addresses: list[str]) -> str:
+        checksum_wallets: list[str] = []
+        for raw in wallet_addresses or []:
+            try:
+                checksum_wallets.append(checksum_address(raw))
+            except ValueError:
+                return tool_error(f"Invalid wallet address supplied: {raw}")
+        if not checksum_wallets:
+            return tool_error("Provide at least one wallet address.")
+        # Preferred: every getScore eth_call in one JSON-RPC batch round-trip
+        score_fn = contract_fns["getScore"]
+        if score_fn is not None:
+            try:
+                with w3.batch_requests() as batch:
+                    for wallet in checksum_wallets:
+                        batch.add(score_fn(wallet))
+                    responses = batch.execute()
+                return tool_success(
+                    {
+                        "scores": [
+                            {
+                                "wallet": wallet,
+                                "value": int(value),
+                                "timestamp": int(timestamp),
+                                "valid": bool(valid),
+                            }
+                            for wallet, (value, timestamp, valid) in zip(
+                                checksum_wallets, responses
+                            )
+                        ],
+                        "strategy": "batch_getScore",
+                    }
+                )
+            except Exception:
+                pass
+        # Fallback: one call per wallet, keeping getScore's ABI fallbacks
+        scores: list[Dict[str, Any]] = []
+        for wallet in checksum_wallets:
+            result = _loads(getScore_tool(wallet))
+            result.pop("success", None)
+            scores.append(result)
+        return tool_success({"scores": scores, "strategy": "per_wallet"})
+
+    register(
+        "getScores",
+        "Read TrustMint SBT score tuples for several wallets in one batched RPC request.",
+        {
+            "type": "object",
+            "properties": {
+                "wallet_addresses": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Wallet addresses to query.",
+                }
+            },
+            "required": ["wallet_addresses"],
+        },
+        getScores_tool,
+    )
+
     # ---- Writes ----
-    def _preflight_owner(owner_address: str) -> Optional[str]:
+    owner_cache_key = (get_chain_id(w3), contract.address)
+
+    def _owner_cached() -> bool:
+        return owner_cache_key in _CONTRACT_OWNERS and not os.getenv(
+            "ARC_REFRESH_CONTRACT_OWNER"
+        )
+
+    def _chain_owner(refresh: bool = False) -> str:
+        if refresh or not _owner_cached():
+            _CONTRACT_OWNERS[owner_cache_key] = contract_fns["owner"]().call()
+        return _CONTRACT_OWNERS[owner_cache_key]
+
+    def _batched_preflight(
+        owner_address: str, wallet: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch a write's owner, SBT, pending-nonce and latest-block reads in one round-trip.
+
+        Returns an empty dict if the batch fails; callers then read individually.
+        """
+        keys: list[str] = []
+        try:
+            with w3.batch_requests() as batch:
+                if contract_fns["owner"] is not None and not _owner_cached():
+                    batch.add(contract_fns["owner"]())
+                    keys.append("owner")
+                if wallet is not None and contract_fns["hasSbt"] is not None:
+                    batch.add(contract_fns["hasSbt"](wallet))
+                    keys.append("has_sbt")
+                batch.add(w3.eth.get_transaction_count(owner_address, "pending"))
+                keys.append("pending_nonce")
+                batch.add(w3.eth.get_block("latest"))
+                keys.append("latest")
+                responses = batch.execute()
+        except Exception:
+            return {}
+        prefetched = dict(zip(keys, responses))
+        try:
+            prime_base_fee(w3, prefetched["latest"])
+        except Exception:
+            pass
+        return prefetched
+
+    def _preflight_owner(owner_address: str, chain_owner: Any = None) -> Optional[str]:
         """Return None if OK; otherwise error message."""
         try:
-            owner_fn = getattr(contract.functions, "owner", None)
+            owner_fn = contract_fns["owner"]
             if owner_fn is None:
                 return None
-            chain_owner = owner_fn().call()
+            if chain_owner is not None:
+                _CONTRACT_OWNERS[owner_cache_key] = chain_owner
+            else:
+                was_cached = _owner_cached()
+                chain_owner = _chain_owner()
+                if was_cached and chain_owner.lower() != owner_address.lower():
+                    # The remembered owner may predate a transferOwnership
+                    chain_owner = _chain_owner(refresh=True)
             if chain_owner.lower() != owner_address.lower():
                 return f"PRIVATE_KEY address {owner_address} is not the contract owner {chain_owner}."
             return None
@@ -285,45 +446,38 @@ def build_llm_toolkit(
                 "PRIVATE_KEY not configured. Configure it in .env to submit transactions."
             )
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Invalid wallet address supplied.")
+        # Validate locally before the owner/fee/nonce RPCs below
         try:
-            owner_acct = w3.eth.account.from_key(derived_private_key)
-        except Exception as exc:
-            return tool_error(f"Unable to derive signer from private key: {exc}")
+            score_value = int(score_value)
+        except (TypeError, ValueError):
+            return tool_error("Invalid score value; enter an integer.")
+        if signer_address is None:
+            return tool_error(
+                signer_error or "Unable to derive signer from private key."
+            )
+        prefetched = _batched_preflight(signer_address)
         # Owner check (when available)
-        msg = _preflight_owner(owner_acct.address)
+        msg = _preflight_owner(signer_address, prefetched.get("owner"))
         if msg:
             return tool_error(msg)
         try:
-            score_value = int(score_value)
             fees = fee_params(w3, gas_price_gwei)
-            nonce = next_nonce(w3, owner_acct.address)
-            fn = getattr(contract.functions, "issueScore", None)
+            nonce = next_nonce(
+                w3, signer_address, prefetched.get("pending_nonce")
+            )
+            fn = contract_fns["issueScore"]
             if fn is None:
-                fb = w3.eth.contract(
-                    address=contract.address,
-                    abi=[
-                        {
-                            "name": "issueScore",
-                            "type": "function",
-                            "stateMutability": "nonpayable",
-                            "inputs": [
-                                {"name": "borrower", "type": "address"},
-                                {"name": "value", "type": "uint256"},
-                            ],
-                            "outputs": [],
-                        }
-                    ],
-                )
+                fb = _fallback_contract(w3, contract.address, "issueScore")
                 fn = fb.functions.issueScore
             tx = fn(checksum_wallet, score_value).build_transaction(
                 {
-                    "from": owner_acct.address,
+                    "from": signer_address,
                     "nonce": nonce,
                     "gas": default_gas_limit,
-                    "chainId": w3.eth.chain_id,
+                    "chainId": resolve_chain_id(w3),
                     **fees,
                 }
             )
@@ -387,46 +541,41 @@ def build_llm_toolkit(
                 "PRIVATE_KEY not configured. Configure it in .env to submit transactions."
             )
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return tool_error("Invalid wallet address supplied.")
-        try:
-            owner_acct = w3.eth.account.from_key(derived_private_key)
-        except Exception as exc:
-            return tool_error(f"Unable to derive signer from private key: {exc}")
+        if signer_address is None:
+            return tool_error(
+                signer_error or "Unable to derive signer from private key."
+            )
+        prefetched = _batched_preflight(signer_address, checksum_wallet)
         # Owner check (when available)
-        msg = _preflight_owner(owner_acct.address)
+        msg = _preflight_owner(signer_address, prefetched.get("owner"))
         if msg:
             return tool_error(msg)
         # Preflight: ensure SBT is minted to avoid revert
-        if not _has_sbt(w3, contract, checksum_wallet):
+        has_sbt = prefetched.get("has_sbt")
+        if has_sbt is None:
+            has_sbt = _has_sbt(w3, contract, contract_fns, checksum_wallet)
+        if not has_sbt:
             return tool_error(
                 "SBT not minted for this wallet; revokeScore would revert."
             )
         try:
             fees = fee_params(w3, gas_price_gwei)
-            nonce = next_nonce(w3, owner_acct.address)
-            fn = getattr(contract.functions, "revokeScore", None)
+            nonce = next_nonce(
+                w3, signer_address, prefetched.get("pending_nonce")
+            )
+            fn = contract_fns["revokeScore"]
             if fn is None:
-                fb = w3.eth.contract(
-                    address=contract.address,
-                    abi=[
-                        {
-                            "name": "revokeScore",
-                            "type": "function",
-                            "stateMutability": "nonpayable",
-                            "inputs": [{"name": "borrower", "type": "address"}],
-                            "outputs": [],
-                        }
-                    ],
-                )
+                fb = _fallback_contract(w3, contract.address, "revokeScore")
                 fn = fb.functions.revokeScore
             tx = fn(checksum_wallet).build_transaction(
                 {
-                    "from": owner_acct.address,
+                    "from": signer_address,
                     "nonce": nonce,
                     "gas": default_gas_limit,
-                    "chainId": w3.eth.chain_id,
+                    "chainId": resolve_chain_id(w3),
                     **fees,
                 }
             )
@@ -486,12 +635,16 @@ def build_sbt_guard(
     w3: Web3,
     contract: Contract,
 ) -> Callable[[str], Optional[str]]:
+    contract_fns = optional_contract_functions(
+        contract, "hasSbt", "tokenIdOf", "ownerOf"
+    )
+
     def guard(wallet_address: str) -> Optional[str]:
         try:
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_wallet = checksum_address(wallet_address)
         except ValueError:
             return "Borrower wallet address is invalid."
-        if _has_sbt(w3, contract, checksum_wallet):
+        if _has_sbt(w3, contract, contract_fns, checksum_wallet):
             return None
         return "Borrower must hold the required TrustMint SBT credential before requesting this action."
 
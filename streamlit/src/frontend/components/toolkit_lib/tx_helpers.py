@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from typing import Any, Dict, Optional, Tuple
 
 from web3 import Web3
 from web3.contract import Contract
-from web3.exceptions import Web3Exception
+from web3.exceptions import TimeExhausted, TransactionNotFound, Web3Exception
 
 import streamlit as st
 
-from ..web3_utils import encode_contract_call
+from ..web3_utils import checksum_address, encode_contract_call, get_chain_id
+
+# Arc seals ~200 ms miniblocks; polling faster than that only adds RPC load.
+# Slow inclusions back off to RECEIPT_POLL_MAX_DELAY instead of polling flat out.
+# Env overrides (optional) for slower chains/RPCs: ARC_RECEIPT_POLL_S (initial
+# interval), ARC_RECEIPT_TIMEOUT_S.
+RECEIPT_POLL_LATENCY = 0.2
+RECEIPT_POLL_MAX_DELAY = 2.0
+RECEIPT_TIMEOUT = 120.0
 
 _CUSTOM_ERROR_MAP: Dict[str, Tuple[str, Tuple[str, ...]]] = {
     "33b2879b": ("DepositAmountZero", ()),
@@ -37,24 +47,68 @@ _CUSTOM_ERROR_MAP: Dict[str, Tuple[str, Tuple[str, ...]]] = {
 }
 
 
+# Base fee moves every block, so a fetched value is only reused briefly.
+BASE_FEE_TTL_SECONDS = 5.0
+
+# Whether a chain exposes baseFeePerGas never changes mid-session.
+_EIP1559_SUPPORT: Dict[int, bool] = {}
+
+
+def _latest_base_fee(w3: Web3) -> Optional[int]:
+    """Latest block's base fee (None on legacy chains) from at most one RPC per TTL."""
+    chain_id = get_chain_id(w3)
+    if chain_id is not None and _EIP1559_SUPPORT.get(chain_id) is False:
+        return None
+    cached = st.session_state.get(f"_basefee_{chain_id}")
+    if (
+        isinstance(cached, tuple)
+        and time.monotonic() - cached[0] < BASE_FEE_TTL_SECONDS
+    ):
+        return cached[1]
+    return prime_base_fee(w3, w3.eth.get_block("latest"))
+
+
+def prime_base_fee(w3: Web3, latest: Any) -> Optional[int]:
+    """Seed the base-fee cache from an already fetched latest block (e.g. a batch)."""
+    chain_id = get_chain_id(w3)
+    base_fee = latest.get("baseFeePerGas")
+    base = int(base_fee) if base_fee is not None else None
+    if chain_id is not None:
+        _EIP1559_SUPPORT[chain_id] = base is not None
+    st.session_state[f"_basefee_{chain_id}"] = (time.monotonic(), base)
+    return base
+
+
 def supports_eip1559(w3: Web3) -> bool:
     try:
-        latest = w3.eth.get_block("latest")
-        return "baseFeePerGas" in latest and latest["baseFeePerGas"] is not None
+        return _latest_base_fee(w3) is not None
     except Exception:
         return False
 
 
 def fee_params(w3: Web3, gas_price_gwei: str) -> Dict[str, int]:
     """Return fee params for tx: EIP-1559 when supported; otherwise legacy gasPrice.
-    Env overrides (optional): ARC_PRIORITY_FEE_GWEI, ARC_MAX_FEE_GWEI
+    Env overrides (optional): ARC_PRIORITY_FEE_GWEI, ARC_MAX_FEE_GWEI. With both
+    set they skip the base-fee read once the chain is known to support EIP-1559;
+    ARC_FORCE_LEGACY=1 skips the EIP-1559 probe and always returns gasPrice.
     """
-    if supports_eip1559(w3):
+    if os.getenv("ARC_FORCE_LEGACY", "").strip().lower() in ("1", "true", "yes"):
+        return {"gasPrice": Web3.to_wei(int(gas_price_gwei), "gwei")}
+    pinned_prio = os.getenv("ARC_PRIORITY_FEE_GWEI")
+    pinned_max = os.getenv("ARC_MAX_FEE_GWEI")
+    if pinned_prio and pinned_max and _EIP1559_SUPPORT.get(get_chain_id(w3)) is True:
         try:
-            latest = w3.eth.get_block("latest")
-            base = int(latest["baseFeePerGas"])  # wei
-        except Exception:
-            base = Web3.to_wei(int(gas_price_gwei), "gwei") // 2
+            return {
+                "maxFeePerGas": Web3.to_wei(int(pinned_max), "gwei"),
+                "maxPriorityFeePerGas": Web3.to_wei(int(pinned_prio), "gwei"),
+            }
+        except ValueError:
+            pass
+    try:
+        base = _latest_base_fee(w3)  # wei
+    except Exception:
+        base = None
+    if base is not None:
         prio_gwei = int(os.getenv("ARC_PRIORITY_FEE_GWEI", "1"))
         max_gwei = os.getenv("ARC_MAX_FEE_GWEI")
         prio = Web3.to_wei(prio_gwei, "gwei")
@@ -68,20 +122,92 @@ def fee_params(w3: Web3, gas_price_gwei: str) -> Dict[str, int]:
     return {"gasPrice": Web3.to_wei(int(gas_price_gwei), "gwei")}
 
 
-def next_nonce(w3: Web3, addr: str) -> int:
-    """Pending nonce + session monotonic bump to avoid duplicates on fast clicks."""
-    try:
-        pending = w3.eth.get_transaction_count(addr, "pending")
-    except Exception:
-        pending = w3.eth.get_transaction_count(addr)
-    key = f"_nonce_{addr.lower()}"
-    last = st.session_state.get(key)
-    if isinstance(last, int) and pending <= last:
-        pending = last + 1
-    st.session_state[key] = pending
+# Last nonce handed out per (chain, signer), with when it was reserved. Process-wide
+# so sessions signing with the same server-side key never share a nonce. An entry
+# only bridges the gap until the node's pending count catches up: it is dropped once
+# the chain reaches it, and after NONCE_RESERVATION_TTL so a transaction that was
+# never broadcast or got dropped cannot hold the signer's nonces forever.
+NONCE_RESERVATION_TTL = 30.0
+_NONCE_CACHE: Dict[Tuple[Optional[int], str], Tuple[int, float]] = {}
+_NONCE_LOCK = threading.Lock()
+
+
+def next_nonce(w3: Web3, addr: str, pending: Optional[int] = None) -> int:
+    """Reserve the next nonce: the pending count, bumped past unconfirmed reservations.
+
+    ``pending`` may be supplied when the count was already fetched in a batch.
+    """
+    if pending is None:
+        try:
+            pending = w3.eth.get_transaction_count(addr, "pending")
+        except Exception:
+            pending = w3.eth.get_transaction_count(addr)
+    key = (get_chain_id(w3), addr.lower())
+    now = time.monotonic()
+    with _NONCE_LOCK:
+        reserved = _NONCE_CACHE.get(key)
+        if (
+            reserved is not None
+            and pending <= reserved[0]
+            and now - reserved[1] < NONCE_RESERVATION_TTL
+        ):
+            pending = reserved[0] + 1
+        _NONCE_CACHE[key] = (pending, now)
     return pending
 
 
+def _release_nonce(w3: Web3, tx: Dict[str, Any]) -> None:
+    """Drop the reservation for ``tx`` when its send failed and nothing came after it."""
+    sender = tx.get("from")
+    if not sender or tx.get("nonce") is None:
+        return
+    key = (get_chain_id(w3), str(sender).lower())
+    with _NONCE_LOCK:
+        reserved = _NONCE_CACHE.get(key)
+        if reserved is not None and reserved[0] == int(tx["nonce"]):
+            del _NONCE_CACHE[key]
+
+
+def resolve_chain_id(w3: Web3) -> int:
+    """Chain ID from the per-endpoint cache, falling back to a live ``eth_chainId``."""
+    cached = get_chain_id(w3)
+    return cached if cached is not None else int(w3.eth.chain_id)
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def wait_for_receipt(
+    w3: Web3, tx_hash: Any, timeout: Optional[float] = None
+) -> Any:
+    """Poll for a receipt, doubling the delay from the initial interval up to a cap.
+
+    Raises ``TimeExhausted`` after ``timeout`` seconds, like web3's own helper.
+    """
+    if timeout is None:
+        timeout = _env_seconds("ARC_RECEIPT_TIMEOUT_S", RECEIPT_TIMEOUT)
+    delay = _env_seconds("ARC_RECEIPT_POLL_S", RECEIPT_POLL_LATENCY)
+    max_delay = max(delay, RECEIPT_POLL_MAX_DELAY)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeExhausted(
+                f"Transaction {Web3.to_hex(tx_hash)} is not in the chain after {timeout} seconds"
+            )
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
 def sign_and_send(w3: Web3, private_key: str, tx: Dict[str, Any]) -> Dict[str, Any]:
     try:
         signed = w3.eth.account.sign_transaction(tx, private_key=private_key)
@@ -92,10 +218,9 @@ def sign_and_send(w3: Web3, private_key: str, tx: Dict[str, Any]) -> Dict[str, A
             return {
                 "error": "Signed transaction missing rawTransaction/raw_transaction"
             }
-        local_hash = Web3.keccak(raw_tx).hex()
         try:
             tx_hash = w3.eth.send_raw_transaction(raw_tx)
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = wait_for_receipt(w3, tx_hash)
             formatted = format_receipt(receipt)
             status = formatted.get("status")
             if status in (1, True):
@@ -112,9 +237,10 @@ def sign_and_send(w3: Web3, private_key: str, tx: Dict[str, Any]) -> Dict[str, A
         except Web3Exception as exc:
             text = str(exc)
             if "already known" in text:
-                return {"txHash": local_hash, "status": "already_known"}
+                return {"txHash": Web3.keccak(raw_tx).hex(), "status": "already_known"}
             if "replacement transaction underpriced" in text:
-                return {"txHash": local_hash, "status": "underpriced"}
+                return {"txHash": Web3.keccak(raw_tx).hex(), "status": "underpriced"}
+            _release_nonce(w3, tx)
             raise
     except Exception as exc:
         return {"error": f"sign/send error: {exc}"}
@@ -218,6 +344,23 @@ def _decode_custom_error(data_hex: Optional[str]) -> Optional[str]:
     return f"{name}({', '.join(values)})"
 
 
+def optional_contract_functions(contract: Contract, *names: str) -> Dict[str, Any]:
+    """Bind ABI functions by name once, mapping names absent from the ABI to None.
+
+    ``getattr(contract.functions, name, None)`` on a missing name raises and
+    swallows ABIFunctionNotFound inside web3 on every call.
+    """
+    present = {
+        item.get("name")
+        for item in contract.abi or []
+        if item.get("type", "function") == "function"
+    }
+    return {
+        name: getattr(contract.functions, name) if name in present else None
+        for name in names
+    }
+
+
 def metamask_tx_request(
     contract: Contract,
     fn_name: str,
@@ -241,7 +384,7 @@ def metamask_tx_request(
         req["value"] = hex(value_wei)
     if from_address:
         try:
-            req["from"] = Web3.to_checksum_address(from_address)
+            req["from"] = checksum_address(from_address)
         except Exception:
             req["from"] = from_address
     return req
@@ -108,8 +108,14 @@ def wallet_command(
     autoconnect: Optional[bool] = None,
     command_payload: Optional[Dict[str, Any]] = None,
     command_sequence: Optional[int] = None,
+    include_status: bool = False,
 ) -> Any:
-    """Execute a headless wallet command and return the component payload."""
+    """Execute a headless wallet command and return the component payload.
+
+    With ``include_status=True`` the same component call doubles as the status
+    probe and returns ``{"status": ..., "command_result": ...}``, where
+    ``command_result`` is only set once the frontend answers this sequence.
+    """
 
     if command_sequence is not None:
         sequence = command_sequence
@@ -117,7 +123,7 @@ def wallet_command(
         sequence = int(time.time() * 1000)
     else:
         sequence = None
-    return connect_wallet(
+    payload = connect_wallet(
         key=key,
         require_chain_id=require_chain_id,
         tx_request=tx_request,
@@ -130,6 +136,24 @@ def wallet_command(
         command_payload=command_payload,
         command_sequence=sequence,
     )
+    if not include_status:
+        return payload
+    return _split_command_payload(payload, sequence if command else None)
+
+
+def _split_command_payload(payload: Any, sequence: Optional[int]) -> Dict[str, Any]:
+    """Separate a headless command response from a plain wallet status payload.
+
+    The component keeps returning its last command response until the next one,
+    so an unmatched response still serves as the wallet status (address/chainId).
+    """
+    if (
+        isinstance(payload, dict)
+        and sequence is not None
+        and payload.get("commandSequence") == sequence
+    ):
+        return {"status": None, "command_result": payload}
+    return {"status": payload, "command_result": None}
 
 
 if __name__ == "__main__":
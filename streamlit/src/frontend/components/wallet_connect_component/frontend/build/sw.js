@@ -0,0 +1,61 @@
+// Service worker for the wallet connect component iframe.
+// Scope is the component's own directory, so it only sees the iframe HTML and
+// the hashed Vite bundles under ./assets/. Cache-first with background
+// revalidation keeps repeat page loads off the network.
+const CACHE_NAME = 'wallet-connect-assets-v1';
+const PRECACHE_URLS = ['./', './index.html'];
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches
+      .open(CACHE_NAME)
+      .then((cache) => cache.addAll(PRECACHE_URLS))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((keys) =>
+        Promise.all(
+          keys.filter((key) => key !== CACHE_NAME).map((key) => caches.delete(key))
+        )
+      )
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener('fetch', (event) => {
+  const request = event.request;
+  if (request.method !== 'GET') {
+    return;
+  }
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin || !url.pathname.startsWith(new URL('./', self.location).pathname)) {
+    return;
+  }
+  // Streamlit appends per-session query params to the iframe URL; key the
+  // cache on the path so every session shares the same entry.
+  const cacheKey = url.origin + url.pathname;
+  event.respondWith(
+    caches.open(CACHE_NAME).then((cache) =>
+      cache.match(cacheKey).then((cached) => {
+        const network = fetch(request)
+          .then((response) => {
+            if (response && response.ok) {
+              cache.put(cacheKey, response.clone());
+            }
+            return response;
+          })
+          .catch(() => cached);
+        if (cached) {
+          event.waitUntil(network);
+          return cached;
+        }
+        return network;
+      })
+    )
+  );
+});
@@ -3,22 +3,62 @@
 from __future__ import annotations
 
 import json
+import mmap
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional, Sequence
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import streamlit as st
 from web3 import Web3
 from web3.contract import Contract
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+@lru_cache(maxsize=1024)
+def checksum_address(address: str) -> str:
+    """Memoised ``Web3.to_checksum_address`` for addresses reused across reruns."""
+    return Web3.to_checksum_address(address)
+
+
+# Sized for the concurrent read-only tool calls in a single LLM turn.
+_RPC_POOL_MAXSIZE = 16
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_web3_client(rpc_url: str) -> Web3:
+    """Process-wide client per RPC URL so reruns reuse one keep-alive HTTP session."""
+    session = requests.Session()
+    # Retry only failed connects: the request never reached the node, so even an
+    # eth_sendRawTransaction POST is safe to resend. Errors after the request was
+    # sent are not retried, as the node may already have acted on it.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=_RPC_POOL_MAXSIZE,
+        max_retries=Retry(
+            total=2, connect=2, read=0, backoff_factor=0.1, allowed_methods=None
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return Web3(Web3.HTTPProvider(rpc_url, session=session))
+
 
 def get_web3_client(rpc_url: Optional[str]) -> Optional[Web3]:
-    """Create a Web3 client if an RPC URL is provided and reachable.
+    """Return the shared Web3 client if an RPC URL is provided and reachable.
 
     Returns None if rpc_url is falsy or if initialization fails.
     """
     if not rpc_url:
         return None
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        w3 = _cached_web3_client(rpc_url)
         # Optional ping; if provider is down this may raise
         _ = w3.eth.chain_id  # noqa: F841
         return w3
@@ -26,6 +66,65 @@ def get_web3_client(rpc_url: Optional[str]) -> Optional[Web3]:
         return None
 
 
+@st.cache_resource(show_spinner=False)
+def _cached_chain_id(endpoint: str, _w3: Web3) -> int:
+    return int(_w3.eth.chain_id)
+
+
+def get_chain_id(w3: Optional[Web3]) -> Optional[int]:
+    """Chain ID for ``w3``, fetched once per RPC endpoint.
+
+    Returns None if the client is missing or the RPC call fails.
+    """
+    if w3 is None:
+        return None
+    try:
+        endpoint = getattr(w3.provider, "endpoint_uri", None)
+        if not endpoint:
+            return int(w3.eth.chain_id)
+        return _cached_chain_id(str(endpoint), w3)
+    except Exception:
+        return None
+
+
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON file, mapping it read-only into orjson when available."""
+    with open(path, "rb") as fh:
+        if orjson is None:
+            return json.load(fh)
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def _resolve_abi_path(abi_path: str) -> Path:
+    # Resolve path: if relative, resolve from repo root (where .env is loaded)
+    p = Path(abi_path).expanduser()
+    if not p.is_absolute():
+        # Get repo root
+        # web3_utils.py is at streamlit/src/frontend/components/web3_utils.py
+        # Repo root is 4 levels up: components -> frontend -> src -> streamlit -> repo_root
+        repo_root = Path(__file__).resolve().parents[4]
+        return (repo_root / p).resolve()
+    return p.resolve()
+
+
+def abi_file_mtime(abi_path: Optional[str]) -> int:
+    """Modification time (ns) of an ABI file, or 0 if it cannot be stat'ed.
+
+    Intended as part of a cache key so edited ABIs are picked up without a restart.
+    """
+    if not abi_path:
+        return 0
+    try:
+        return _resolve_abi_path(abi_path).stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 def load_contract_abi(abi_path: Optional[str]) -> Optional[list[dict[str, Any]]]:
     """Load a contract ABI JSON from disk.
 
@@ -35,16 +134,7 @@ def load_contract_abi(abi_path: Optional[str]) -> Optional[list[dict[str, Any]]]
     if not abi_path:
         return None
     try:
-        # Resolve path: if relative, resolve from repo root (where .env is loaded)
-        p = Path(abi_path).expanduser()
-        if not p.is_absolute():
-            # Get repo root
-            # web3_utils.py is at streamlit/src/frontend/components/web3_utils.py
-            # Repo root is 4 levels up: components -> frontend -> src -> streamlit -> repo_root
-            repo_root = Path(__file__).resolve().parents[4]
-            p = (repo_root / p).resolve()
-        else:
-            p = p.resolve()
+        p = _resolve_abi_path(abi_path)
 
         if not p.exists():
             raise FileNotFoundError(f"ABI file not found: {p}")
@@ -52,11 +142,10 @@ def load_contract_abi(abi_path: Optional[str]) -> Optional[list[dict[str, Any]]]
         if not p.is_file():
             raise ValueError(f"Path is not a file: {p}")
 
-        text = p.read_text(encoding="utf-8")
-        if not text.strip():
+        if p.stat().st_size == 0:
             raise ValueError(f"ABI file is empty: {p}")
 
-        data = json.loads(text)
+        data = _read_json_file(p)
         # Some artifact JSONs wrap the ABI under an "abi" key
         if isinstance(data, dict) and "abi" in data and isinstance(data["abi"], list):
             return data["abi"]  # type: ignore[return-value]